@@ -7,6 +7,7 @@ import random
 import asyncio
 import logging
 from typing import Optional, Dict, Any
+from urllib.parse import urlparse
 try:
     from patchright.async_api import async_playwright as async_patchright
     _HAS_PATCHRIGHT = True
@@ -26,6 +27,17 @@ from app.stealth import apply_chromium_js_patches
 
 logger = logging.getLogger(__name__)
 
+
+def _site_domain(url: str) -> str:
+    """Lowercased host of url with any leading www. stripped.
+
+    Used to key per-domain locks, so www.example.com and example.com share
+    one.
+    """
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
 # Comprehensive Chromium launch args for stealth and stability.
 # Shared by BrowserEngine and BrowserPool.
 CHROMIUM_STEALTH_ARGS = [
@@ -416,11 +428,7 @@ class BrowserEngine:
 
     def _get_domain_lock(self, url: str) -> asyncio.Lock:
         """Get or create a per-domain lock. Only one crawl per domain at a time."""
-        from urllib.parse import urlparse
-        netloc = urlparse(url).netloc.lower()
-        # Strip www. so www.example.com and example.com share a lock
-        if netloc.startswith("www."):
-            netloc = netloc[4:]
+        netloc = _site_domain(url)
         if netloc not in self._domain_locks:
             self._domain_locks[netloc] = asyncio.Lock()
         return self._domain_locks[netloc]
@@ -461,6 +469,12 @@ class BrowserEngine:
         # Compute client deadline if X-Client-Timeout was provided
         deadline = (_time.monotonic() + client_timeout_seconds) if client_timeout_seconds else None
 
+        # The challenge wait's asset blocking is a catch-all route that falls
+        # back for everything it keeps, which Camoufox can't re-route through
+        # the proxy (see setup_request_interception). Screenshots need the
+        # images and fonts, so skip it then too.
+        block_challenge_assets = not take_screenshot and settings.browser_engine != "camoufox"
+
         async with domain_lock:
             async with self._context_semaphore:
                 # Serialize context creation to avoid concurrent proxy auth
@@ -497,8 +511,8 @@ class BrowserEngine:
                             # Challenge detection + resolution (integrated from challenge_solver)
                             challenge_result = None
                             try:
-                                from app.challenge_solver import resolve_challenge
-                                challenge_result = await resolve_challenge(page, site_url=url)
+                                from app.challenge_solver import ChallengeType, resolve_challenge
+                                challenge_result = await resolve_challenge(page, site_url=url, block_assets=block_challenge_assets)
                                 if challenge_result.resolved and challenge_result.method != "none":
                                     logger.info(f"Challenge resolved via {challenge_result.method} in {challenge_result.wait_time_ms}ms")
                                     try:
@@ -564,7 +578,7 @@ class BrowserEngine:
                                 "content_length": len(content),
                                 "render_mode": "js_rendered" if javascript_enabled else "html_only",
                                 "wait_strategy": wait_strategy,
-                                "challenge_detected": bool(challenge_result and challenge_result.challenge_type.value != "none"),
+                                "challenge_detected": bool(challenge_result and challenge_result.challenge_type is not ChallengeType.NONE),
                                 "challenge_resolved": bool(challenge_result and challenge_result.resolved),
                                 "challenge_method": challenge_result.method if challenge_result else None,
                                 "challenge_wait_ms": challenge_result.wait_time_ms if challenge_result else 0,
@@ -623,7 +637,7 @@ class BrowserEngine:
                                 logger.info(f"Navigation timed out on attempt {attempt + 1}, checking for Cloudflare challenge on partial page")
                                 try:
                                     from app.challenge_solver import resolve_challenge
-                                    challenge_result = await resolve_challenge(page, site_url=url)
+                                    challenge_result = await resolve_challenge(page, site_url=url, block_assets=block_challenge_assets)
                                     if challenge_result.resolved and challenge_result.method != "none":
                                         logger.info(f"Challenge resolved after timeout via {challenge_result.method} in {challenge_result.wait_time_ms}ms — extracting content")
                                         # Challenge solved — page should now have real content. Wait for DOM to settle.
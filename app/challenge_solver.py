@@ -8,6 +8,9 @@ Falls back to CapSolver API for visible Turnstile challenges that don't auto-res
 import asyncio
 import logging
 import os
+import random
+import re
+import time
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
@@ -24,7 +27,7 @@ class ChallengeType(str, Enum):
     NONE = "none"
 
 
-@dataclass
+@dataclass(slots=True)
 class ChallengeDetection:
     """Result of challenge detection."""
     detected: bool = False
@@ -33,7 +36,7 @@ class ChallengeDetection:
     selector_matched: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ChallengeResult:
     """Result of challenge resolution attempt."""
     resolved: bool = False
@@ -41,6 +44,7 @@ class ChallengeResult:
     method: str = "none"  # "auto_resolve", "capsolver", "none"
     wait_time_ms: int = 0
     error: Optional[str] = None
+    last_detection: Optional[ChallengeDetection] = None  # most recent probe of the page
 
 
 # Selectors that indicate a Cloudflare challenge is present
@@ -83,120 +87,358 @@ CHALLENGE_TITLE_PATTERNS = [
     'sicherheitsüberprüfung',
 ]
 
+# Keywords for the content heuristic, and the page size above which it is skipped
+CF_CONTENT_SIGNALS = [
+    "cloudflare", "cf-browser-verification", "ray id",
+    "challenge-platform", "turnstile", "cf_chl_opt",
+    "performance & security by",
+]
+_CONTENT_HEURISTIC_MAX_LEN = 10000
+_CF_SIGNAL_THRESHOLD = 2  # distinct signals needed to call it a challenge
+
+# Elements that may carry the Turnstile sitekey, in lookup order
+_SITEKEY_SELECTORS = (
+    '.cf-turnstile[data-sitekey]',
+    'div[data-turnstile-sitekey]',
+    'iframe[src*="challenges.cloudflare.com"]',
+)
+
+# CapSolver API endpoints
+_CAPSOLVER_CREATE_URL = "https://api.capsolver.com/createTask"
+_CAPSOLVER_RESULT_URL = "https://api.capsolver.com/getTaskResult"
+
+# CapSolver result polling: exponential backoff in seconds with +/- jitter so
+# concurrent solves don't poll the API in lock-step
+_CAPSOLVER_POLL_INITIAL_S = 1.0
+_CAPSOLVER_POLL_MAX_S = 5.0
+_CAPSOLVER_POLL_BACKOFF = 1.5
+_CAPSOLVER_POLL_JITTER = 0.25
+
+# Shared HTTP session for CapSolver create/poll requests, created on first use
+# so keep-alive connections to the API are reused across solves and polls.
+_CAPSOLVER_SESSION = None
+
+# Subresource types aborted while waiting on a challenge. None of them affect
+# whether the challenge clears; stylesheets are kept because the visibility
+# checks depend on layout.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Initial poll interval per challenge type: JS/browser checks clear in a few
+# seconds, managed challenges take longer so early polls are wasted.
+_POLL_INTERVAL_MS = {
+    ChallengeType.JS_CHALLENGE: 300,
+    ChallengeType.TURNSTILE: 400,
+    ChallengeType.BROWSER_CHECK: 500,
+    ChallengeType.MANAGED: 800,
+}
+_DEFAULT_POLL_INTERVAL_MS = 500
+
+# Upper bound for the backed-off poll interval and its +/- jitter fraction
+_POLL_BACKOFF_CAP_MS = 1500
+_POLL_JITTER = 0.2
+
+# Single-pass matcher for the title patterns
+_TITLE_RE = re.compile("|".join(re.escape(p) for p in CHALLENGE_TITLE_PATTERNS))
+
+# --- In-browser probes ---
+#
+# The probe walks CHALLENGE_SELECTORS in list order inside one evaluate, so the
+# reported type follows the list's priority. Checks that only need to know
+# whether anything matches use the joined selector groups. Argument lists are
+# built once here and passed by reference to page.evaluate / wait_for_function.
+
+_CHALLENGE_SELECTOR_GROUP = ", ".join(selector for selector, _ in CHALLENGE_SELECTORS)
+_RESOLVED_SELECTOR_GROUP = ", ".join(RESOLVED_SELECTORS)
+_CHALLENGE_SELECTORS_JS = [[selector, ctype.value] for selector, ctype in CHALLENGE_SELECTORS]
+
+# Element visibility as Playwright's is_visible() defines it: a bounding box
+# with non-zero width and height, and not visibility:hidden. A collapsed
+# (0-by-N) Turnstile iframe counts as hidden.
+_JS_VISIBLE_HELPER = """    const _visible = (el) => {
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };"""
+
+# Fused probe behind detect_challenge and every poll: title, challenge/resolved
+# selectors and content-signal hits in one round-trip. Only the signal hits
+# cross IPC, never the HTML.
+_PAGE_PROBE_JS = """([sels, resolvedGroup, signals, maxLen, need]) => {
+""" + _JS_VISIBLE_HELPER + """
+    let challenge = null;
+    for (const [sel, type] of sels) {
+        const el = document.querySelector(sel);
+        if (el) { challenge = {selector: sel, type: type, visible: _visible(el)}; break; }
+    }
+    const resolved = !!document.querySelector(resolvedGroup);
+    const signalHits = [];
+    const html = document.documentElement ? document.documentElement.outerHTML : '';
+    if (html.length < maxLen) {
+        const lower = html.toLowerCase();
+        for (const s of signals) {
+            if (lower.includes(s)) {
+                signalHits.push(s);
+                if (signalHits.length >= need) break;
+            }
+        }
+    }
+    return {title: document.title || '', challenge, resolved, signals: signalHits};
+}"""
+_PAGE_PROBE_ARGS = [
+    _CHALLENGE_SELECTORS_JS, _RESOLVED_SELECTOR_GROUP,
+    CF_CONTENT_SIGNALS, _CONTENT_HEURISTIC_MAX_LEN, _CF_SIGNAL_THRESHOLD,
+]
+
+# Predicate for wait_for_function: truthy once the page no longer looks like a
+# challenge (same title/selector/content rules as the probe) or a resolved
+# indicator appears. Evaluated in the page, so waiting costs no IPC until
+# something actually changes.
+_SETTLED_JS = """([group, resolvedGroup, signals, maxLen, need, titlePatterns]) => {
+    if (document.querySelector(resolvedGroup)) return true;
+    const title = (document.title || '').toLowerCase();
+    if (titlePatterns.some(p => title.includes(p))) return false;
+    if (document.querySelector(group)) return false;
+    const html = document.documentElement ? document.documentElement.outerHTML : '';
+    if (html.length < maxLen) {
+        const lower = html.toLowerCase();
+        let hits = 0;
+        for (const s of signals) {
+            if (lower.includes(s) && ++hits >= need) return false;
+        }
+    }
+    return true;
+}"""
+_SETTLED_ARGS = [
+    _CHALLENGE_SELECTOR_GROUP, _RESOLVED_SELECTOR_GROUP, CF_CONTENT_SIGNALS,
+    _CONTENT_HEURISTIC_MAX_LEN, _CF_SIGNAL_THRESHOLD, CHALLENGE_TITLE_PATTERNS,
+]
+
+# First Turnstile sitekey found across the sitekey selectors, in order: the
+# data-sitekey / data-turnstile-sitekey attributes, else a sitekey= parameter
+# in the element's src. Returns null if none carries one.
+_SITEKEY_PROBE_JS = """(selectors) => {
+    for (const sel of selectors) {
+        const el = document.querySelector(sel);
+        if (!el) continue;
+        const key = el.getAttribute('data-sitekey') || el.getAttribute('data-turnstile-sitekey');
+        if (key) return key;
+        const m = /sitekey=([^&]*)/.exec(el.getAttribute('src') || '');
+        if (m && m[1]) return m[1];
+    }
+    return null;
+}"""
+_SITEKEY_PROBE_ARGS = list(_SITEKEY_SELECTORS)
+
+# Fills the Turnstile response inputs with the solved token and nudges the page
+# to process it. The token is passed as the evaluate argument, never spliced
+# into the source, so the function text is constant.
+_INJECT_TOKEN_JS = """(token) => {
+    // Set token in known Turnstile response inputs
+    const inputs = document.querySelectorAll('input[name="cf-turnstile-response"]');
+    inputs.forEach(input => { input.value = token; });
+
+    const hiddenInputs = document.querySelectorAll('[name*="turnstile"]');
+    hiddenInputs.forEach(input => { input.value = token; });
+
+    // Trigger Cloudflare's callback to process the token
+    // Method 1: Call turnstile callback if available on the widget
+    const widgets = document.querySelectorAll('.cf-turnstile, [data-turnstile-sitekey]');
+    for (const w of widgets) {
+        const callbackName = w.getAttribute('data-callback');
+        if (callbackName && typeof window[callbackName] === 'function') {
+            window[callbackName](token);
+        }
+    }
+
+    // Method 2: Submit the challenge form if present
+    const forms = document.querySelectorAll('form[action*="challenge"]');
+    if (forms.length > 0) {
+        forms[0].submit();
+    }
+
+    // Method 3: Dispatch input event to trigger any listeners
+    inputs.forEach(input => {
+        input.dispatchEvent(new Event('input', { bubbles: true }));
+        input.dispatchEvent(new Event('change', { bubbles: true }));
+    });
+}"""
+
+
+def _now_ms() -> int:
+    """Monotonic clock in whole milliseconds, for elapsed and deadline math."""
+    return time.monotonic_ns() // 1_000_000
+
+
+def _match_title(title: Optional[str]) -> Optional[str]:
+    """Return the challenge title pattern found in title, if any."""
+    m = _TITLE_RE.search(title.lower()) if title else None
+    return m.group(0) if m else None
+
 
 async def detect_challenge(page) -> ChallengeDetection:
     """
     Detect if a Cloudflare challenge is present on the page.
 
+    Title, DOM selectors and the content heuristic are checked in that order,
+    from a single in-page probe.
+
     Args:
         page: Playwright page object
 
     Returns:
         ChallengeDetection with type and confidence
     """
-    # Check title first (fast)
+    detection = _detection_from_probe(await _probe_page(page))
+    if detection.selector_matched.startswith("content_heuristic:"):
+        # Some Cloudflare configs use custom interstitials without the standard selectors
+        logger.info(f"Challenge detected via content heuristic: {detection.selector_matched}")
+    return detection
+
+
+async def _probe_page(page) -> Optional[dict]:
+    """Run the fused challenge probe. Returns None if the page can't be evaluated."""
     try:
-        title = await page.title()
-        title_lower = title.lower() if title else ""
-        for pattern in CHALLENGE_TITLE_PATTERNS:
-            if pattern in title_lower:
-                return ChallengeDetection(
-                    detected=True,
-                    challenge_type=ChallengeType.JS_CHALLENGE,
-                    confidence=0.9,
-                    selector_matched=f"title:{pattern}",
-                )
+        return await page.evaluate(_PAGE_PROBE_JS, _PAGE_PROBE_ARGS)
     except Exception:
-        pass
+        return None
 
-    # Check DOM selectors
-    for selector, challenge_type in CHALLENGE_SELECTORS:
-        try:
-            element = await page.query_selector(selector)
-            if element:
-                visible = await element.is_visible()
-                confidence = 0.95 if visible else 0.7
-                return ChallengeDetection(
-                    detected=True,
-                    challenge_type=challenge_type,
-                    confidence=confidence,
-                    selector_matched=selector,
-                )
-        except Exception:
-            continue
 
-    # Content-based heuristic: if page has very little content and mentions
-    # Cloudflare/challenge keywords, it's likely a challenge page even without
-    # standard selectors (some Cloudflare configs use custom interstitials)
+async def _block_heavy_assets(route) -> None:
+    """Route handler: abort heavy subresources, defer everything else."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.fallback()
+
+
+async def _wait_for_settle(page, timeout_ms: float) -> None:
+    """Wait up to timeout_ms for the page to look challenge-free (browser-side)."""
     try:
-        content = await page.content()
-        if content and len(content) < 10000:
-            content_lower = content.lower()
-            cf_signals = [
-                "cloudflare", "cf-browser-verification", "ray id",
-                "challenge-platform", "turnstile", "cf_chl_opt",
-                "performance & security by",
-            ]
-            matched_signals = [s for s in cf_signals if s in content_lower]
-            if len(matched_signals) >= 2:
-                logger.info(f"Challenge detected via content heuristic: {matched_signals}")
-                return ChallengeDetection(
-                    detected=True,
-                    challenge_type=ChallengeType.MANAGED,
-                    confidence=0.8,
-                    selector_matched=f"content_heuristic:{','.join(matched_signals[:3])}",
-                )
+        await page.wait_for_function(_SETTLED_JS, arg=_SETTLED_ARGS, timeout=max(1, timeout_ms))
     except Exception:
+        # Timeout, or the page navigated mid-wait; the probe decides either way
         pass
 
+
+def _detection_from_probe(probe: Optional[dict]) -> ChallengeDetection:
+    """Map a fused probe result to a detection: title, then selectors, then content signals."""
+    if not probe:
+        return ChallengeDetection(detected=False)
+
+    pattern = _match_title(probe.get("title"))
+    if pattern:
+        return ChallengeDetection(
+            detected=True,
+            challenge_type=ChallengeType.JS_CHALLENGE,
+            confidence=0.9,
+            selector_matched=f"title:{pattern}",
+        )
+
+    hit = probe.get("challenge")
+    if hit:
+        return ChallengeDetection(
+            detected=True,
+            challenge_type=ChallengeType(hit["type"]),
+            confidence=0.95 if hit.get("visible") else 0.7,
+            selector_matched=hit["selector"],
+        )
+
+    matched_signals = probe.get("signals") or []
+    if len(matched_signals) >= _CF_SIGNAL_THRESHOLD:
+        return ChallengeDetection(
+            detected=True,
+            challenge_type=ChallengeType.MANAGED,
+            confidence=0.8,
+            selector_matched=f"content_heuristic:{','.join(matched_signals[:3])}",
+        )
+
     return ChallengeDetection(detected=False)
 
 
 async def wait_for_challenge_resolution(
     page,
     timeout_ms: int = 15000,
-    poll_interval_ms: int = 500,
+    poll_interval_ms: Optional[int] = None,
+    block_assets: bool = True,
+    detection: Optional[ChallengeDetection] = None,
 ) -> ChallengeResult:
     """
     Wait for a Cloudflare challenge to auto-resolve.
 
     Many Turnstile challenges are invisible and auto-resolve within seconds.
-    This function polls the page to detect when the challenge is gone.
+    Between probes it waits browser-side (wait_for_function) for the page to
+    look challenge-free, bounded by an interval that starts at poll_interval_ms
+    (by default chosen per challenge type) and backs off exponentially (with
+    jitter) while the page is unchanged. Any change in the probe result resets
+    the backoff.
+
+    With block_assets, images/fonts/media are aborted for the duration of the
+    wait (the challenge's own reload included) and the route is removed after.
+    The route is a catch-all that falls back for everything else, so leave it
+    off on Camoufox behind a proxy. Registering any route also disables
+    Playwright's HTTP cache for the page while the wait runs.
+
+    Callers that already hold a fresh detection can pass it to skip the
+    initial probe. The returned result carries the last probe's detection.
     """
-    detection = await detect_challenge(page)
+    if detection is None:
+        detection = await detect_challenge(page)
     if not detection.detected:
-        return ChallengeResult(resolved=True, method="none", wait_time_ms=0)
+        return ChallengeResult(resolved=True, method="none", wait_time_ms=0, last_detection=detection)
+
+    if poll_interval_ms is None:
+        poll_interval_ms = _POLL_INTERVAL_MS.get(detection.challenge_type, _DEFAULT_POLL_INTERVAL_MS)
+
+    if block_assets:
+        try:
+            await page.route("**/*", _block_heavy_assets)
+        except Exception:
+            block_assets = False
 
-    start_ms = int(asyncio.get_event_loop().time() * 1000)
+    try:
+        return await _poll_for_resolution(page, detection, timeout_ms, poll_interval_ms)
+    finally:
+        if block_assets:
+            try:
+                await page.unroute("**/*", _block_heavy_assets)
+            except Exception:
+                pass
+
+
+async def _poll_for_resolution(
+    page,
+    detection: ChallengeDetection,
+    timeout_ms: int,
+    poll_interval_ms: int,
+) -> ChallengeResult:
+    """Poll loop behind wait_for_challenge_resolution."""
+    start_ms = _now_ms()
     elapsed = 0
+    attempt = 0
+    last_probe = None
+    current = detection
+    cap_ms = max(_POLL_BACKOFF_CAP_MS, poll_interval_ms)
 
     while elapsed < timeout_ms:
-        await asyncio.sleep(poll_interval_ms / 1000)
-        elapsed = int(asyncio.get_event_loop().time() * 1000) - start_ms
-
-        # Check if challenge resolved
-        current = await detect_challenge(page)
-        if not current.detected:
+        interval_ms = min(cap_ms, poll_interval_ms * 2 ** attempt)
+        interval_ms *= random.uniform(1 - _POLL_JITTER, 1 + _POLL_JITTER)
+        await _wait_for_settle(page, min(interval_ms, timeout_ms - elapsed))
+        elapsed = _now_ms() - start_ms
+
+        # One fused probe per poll: challenge gone, or a resolved indicator
+        probe = await _probe_page(page)
+        current = _detection_from_probe(probe)
+        if not current.detected or (probe and probe.get("resolved")):
             return ChallengeResult(
                 resolved=True,
                 challenge_type=detection.challenge_type,
                 method="auto_resolve",
                 wait_time_ms=elapsed,
+                last_detection=current,
             )
 
-        # Check for resolved indicators
-        for sel in RESOLVED_SELECTORS:
-            try:
-                el = await page.query_selector(sel)
-                if el:
-                    return ChallengeResult(
-                        resolved=True,
-                        challenge_type=detection.challenge_type,
-                        method="auto_resolve",
-                        wait_time_ms=elapsed,
-                    )
-            except Exception:
-                continue
+        # Back off while nothing changes; poll quickly again once the DOM moves
+        attempt = attempt + 1 if probe == last_probe else 0
+        last_probe = probe
 
     # Timeout — challenge didn't auto-resolve
     return ChallengeResult(
@@ -205,6 +447,7 @@ async def wait_for_challenge_resolution(
         method="none",
         wait_time_ms=elapsed,
         error=f"Challenge auto-resolve timeout after {timeout_ms}ms",
+        last_detection=current,
     )
 
 
@@ -230,7 +473,7 @@ async def solve_turnstile_capsolver(
             error="CAPSOLVER_API_KEY not configured",
         )
 
-    start_ms = int(asyncio.get_event_loop().time() * 1000)
+    start_ms = _now_ms()
 
     try:
         # Extract sitekey from Turnstile iframe/widget
@@ -246,7 +489,7 @@ async def solve_turnstile_capsolver(
         # Call CapSolver API
         token = await _call_capsolver(key, site_url, sitekey, timeout_ms)
         if not token:
-            elapsed = int(asyncio.get_event_loop().time() * 1000) - start_ms
+            elapsed = _now_ms() - start_ms
             return ChallengeResult(
                 resolved=False,
                 challenge_type=ChallengeType.TURNSTILE,
@@ -263,7 +506,7 @@ async def solve_turnstile_capsolver(
 
         # Verify resolution
         current = await detect_challenge(page)
-        elapsed = int(asyncio.get_event_loop().time() * 1000) - start_ms
+        elapsed = _now_ms() - start_ms
 
         if not current.detected:
             return ChallengeResult(
@@ -271,6 +514,7 @@ async def solve_turnstile_capsolver(
                 challenge_type=ChallengeType.TURNSTILE,
                 method="capsolver",
                 wait_time_ms=elapsed,
+                last_detection=current,
             )
         else:
             return ChallengeResult(
@@ -279,10 +523,11 @@ async def solve_turnstile_capsolver(
                 method="capsolver",
                 wait_time_ms=elapsed,
                 error="Token injected but challenge still present",
+                last_detection=current,
             )
 
     except Exception as e:
-        elapsed = int(asyncio.get_event_loop().time() * 1000) - start_ms
+        elapsed = _now_ms() - start_ms
         return ChallengeResult(
             resolved=False,
             challenge_type=ChallengeType.TURNSTILE,
@@ -297,12 +542,17 @@ async def resolve_challenge(
     site_url: str,
     auto_wait_ms: int = 15000,
     capsolver_timeout_ms: int = 30000,
+    block_assets: bool = True,
 ) -> ChallengeResult:
     """
     Full challenge resolution pipeline:
     1. Detect if challenge is present
     2. Wait for auto-resolve (invisible Turnstile, JS challenges)
     3. If still blocked and Turnstile visible, try CapSolver
+
+    Pass block_assets=False when the resolved page will be screenshotted, so
+    its images and fonts aren't dropped during the challenge reload, and on
+    Camoufox (see wait_for_challenge_resolution).
     """
     detection = await detect_challenge(page)
     if not detection.detected:
@@ -310,8 +560,10 @@ async def resolve_challenge(
 
     logger.info(f"Challenge detected: {detection.challenge_type} (confidence: {detection.confidence}, selector: {detection.selector_matched})")
 
-    # Step 1: Try auto-resolve
-    auto_result = await wait_for_challenge_resolution(page, timeout_ms=auto_wait_ms)
+    # Step 1: Try auto-resolve (reusing this detection rather than re-probing)
+    auto_result = await wait_for_challenge_resolution(
+        page, timeout_ms=auto_wait_ms, block_assets=block_assets, detection=detection,
+    )
     if auto_result.resolved:
         logger.info(f"Challenge auto-resolved in {auto_result.wait_time_ms}ms")
         return auto_result
@@ -330,6 +582,7 @@ async def resolve_challenge(
                 challenge_type=ChallengeType.TURNSTILE,
                 method="capsolver",
                 wait_time_ms=total_ms,
+                last_detection=capsolver_result.last_detection,
             )
 
     # All attempts failed
@@ -340,32 +593,18 @@ async def resolve_challenge(
         method="none",
         wait_time_ms=total_ms,
         error=auto_result.error or "Challenge not resolved",
+        last_detection=auto_result.last_detection or detection,
     )
 
 
 # --- Internal helpers ---
 
 async def _extract_turnstile_sitekey(page) -> Optional[str]:
-    """Extract the Turnstile sitekey from the page."""
-    selectors = [
-        '.cf-turnstile[data-sitekey]',
-        'div[data-turnstile-sitekey]',
-        'iframe[src*="challenges.cloudflare.com"]',
-    ]
-    for sel in selectors:
-        try:
-            el = await page.query_selector(sel)
-            if el:
-                sitekey = await el.get_attribute('data-sitekey') or await el.get_attribute('data-turnstile-sitekey')
-                if sitekey:
-                    return sitekey
-                # Try extracting from iframe src
-                src = await el.get_attribute('src')
-                if src and 'sitekey=' in src:
-                    return src.split('sitekey=')[1].split('&')[0]
-        except Exception:
-            continue
-    return None
+    """Extract the Turnstile sitekey from the page in a single evaluate."""
+    try:
+        return await page.evaluate(_SITEKEY_PROBE_JS, _SITEKEY_PROBE_ARGS) or None
+    except Exception:
+        return None
 
 
 async def _call_capsolver(
@@ -375,11 +614,6 @@ async def _call_capsolver(
     timeout_ms: int,
 ) -> Optional[str]:
     """Call CapSolver API to solve Turnstile. Returns token or None."""
-    import aiohttp
-
-    create_url = "https://api.capsolver.com/createTask"
-    result_url = "https://api.capsolver.com/getTaskResult"
-
     payload = {
         "clientKey": api_key,
         "task": {
@@ -390,69 +624,84 @@ async def _call_capsolver(
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            # Create task
-            async with session.post(create_url, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+        session = await _get_capsolver_session()
+        # Create task
+        async with session.post(_CAPSOLVER_CREATE_URL, json=payload) as resp:
+            data = await resp.json()
+            if data.get("errorId", 1) != 0:
+                logger.warning(f"CapSolver create error: {data.get('errorDescription')}")
+                return None
+            task_id = data.get("taskId")
+            if not task_id:
+                return None
+
+        # Poll for result
+        poll_payload = {"clientKey": api_key, "taskId": task_id}
+        for delay in _capsolver_poll_delays(timeout_ms):
+            await asyncio.sleep(delay)
+            async with session.post(_CAPSOLVER_RESULT_URL, json=poll_payload) as resp:
                 data = await resp.json()
-                if data.get("errorId", 1) != 0:
-                    logger.warning(f"CapSolver create error: {data.get('errorDescription')}")
-                    return None
-                task_id = data.get("taskId")
-                if not task_id:
+                status = data.get("status")
+                if status == "ready":
+                    return data.get("solution", {}).get("token")
+                if status == "failed":
+                    logger.warning(f"CapSolver task failed: {data.get('errorDescription')}")
                     return None
 
-            # Poll for result
-            poll_payload = {"clientKey": api_key, "taskId": task_id}
-            elapsed = 0
-            while elapsed < timeout_ms:
-                await asyncio.sleep(3)
-                elapsed += 3000
-                async with session.post(result_url, json=poll_payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    data = await resp.json()
-                    status = data.get("status")
-                    if status == "ready":
-                        return data.get("solution", {}).get("token")
-                    if status == "failed":
-                        logger.warning(f"CapSolver task failed: {data.get('errorDescription')}")
-                        return None
-
-            logger.warning(f"CapSolver timeout after {timeout_ms}ms")
-            return None
+        logger.warning(f"CapSolver timeout after {timeout_ms}ms")
+        return None
 
     except Exception as e:
         logger.warning(f"CapSolver error: {e}")
         return None
 
 
+def _capsolver_poll_delays(timeout_ms: int):
+    """Yield jittered, backed-off sleeps (seconds) until timeout_ms has passed.
+
+    The first sleep is 0 so the result is polled immediately; fast solves are
+    often ready before the first backoff step. The deadline is measured on
+    _now_ms(), so time spent in the poll requests counts against it.
+    """
+    deadline_ms = _now_ms() + timeout_ms
+    delay = 0.0
+    while (remaining_ms := deadline_ms - _now_ms()) > 0:
+        jitter = random.uniform(1 - _CAPSOLVER_POLL_JITTER, 1 + _CAPSOLVER_POLL_JITTER)
+        yield min(delay * jitter, remaining_ms / 1000)
+        delay = min(max(delay * _CAPSOLVER_POLL_BACKOFF, _CAPSOLVER_POLL_INITIAL_S), _CAPSOLVER_POLL_MAX_S)
+
+
+async def _get_capsolver_session():
+    """Return the shared CapSolver session, creating it on first use."""
+    global _CAPSOLVER_SESSION
+    import aiohttp
+
+    if _CAPSOLVER_SESSION is None or _CAPSOLVER_SESSION.closed:
+        _CAPSOLVER_SESSION = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=75),
+        )
+    return _CAPSOLVER_SESSION
+
+
+async def warm_capsolver_session() -> None:
+    """Open the shared CapSolver session ahead of the first solve.
+
+    Only when CAPSOLVER_API_KEY is configured; otherwise the CapSolver
+    fallback is disabled and no session is ever needed.
+    """
+    if os.environ.get("CAPSOLVER_API_KEY"):
+        await _get_capsolver_session()
+
+
+async def close_capsolver_session() -> None:
+    """Close the shared CapSolver session. Safe to call if none was opened."""
+    global _CAPSOLVER_SESSION
+    session, _CAPSOLVER_SESSION = _CAPSOLVER_SESSION, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
 async def _inject_turnstile_token(page, token: str):
     """Inject the solved Turnstile token and trigger Cloudflare's callback."""
-    await page.evaluate(f"""() => {{
-        // Set token in known Turnstile response inputs
-        const inputs = document.querySelectorAll('input[name="cf-turnstile-response"]');
-        inputs.forEach(input => {{ input.value = '{token}'; }});
-
-        const hiddenInputs = document.querySelectorAll('[name*="turnstile"]');
-        hiddenInputs.forEach(input => {{ input.value = '{token}'; }});
-
-        // Trigger Cloudflare's callback to process the token
-        // Method 1: Call turnstile callback if available on the widget
-        const widgets = document.querySelectorAll('.cf-turnstile, [data-turnstile-sitekey]');
-        for (const w of widgets) {{
-            const callbackName = w.getAttribute('data-callback');
-            if (callbackName && typeof window[callbackName] === 'function') {{
-                window[callbackName]('{token}');
-            }}
-        }}
-
-        // Method 2: Submit the challenge form if present
-        const forms = document.querySelectorAll('form[action*="challenge"]');
-        if (forms.length > 0) {{
-            forms[0].submit();
-        }}
-
-        // Method 3: Dispatch input event to trigger any listeners
-        inputs.forEach(input => {{
-            input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-            input.dispatchEvent(new Event('change', {{ bubbles: true }}));
-        }});
-    }}""")
+    await page.evaluate(_INJECT_TOKEN_JS, token)
@@ -8,7 +8,7 @@ from typing import Dict, List, Optional
 logger = logging.getLogger(__name__)
 
 # Cookie names worth persisting (Cloudflare anti-bot tokens)
-_CF_COOKIE_NAMES = {"__cf_bm", "cf_clearance", "__cflb"}
+_CF_COOKIE_NAMES = frozenset({"__cf_bm", "cf_clearance", "__cflb"})
 
 
 @dataclass
@@ -17,26 +17,34 @@ class StoredCookie:
     value: str
     domain: str
     path: str = "/"
-    stored_at: float = field(default_factory=time.time)
+    stored_at: float = field(default_factory=time.monotonic)  # monotonic clock
     ttl_seconds: float = 1500  # 25 minutes
 
     @property
     def is_expired(self) -> bool:
-        return (time.time() - self.stored_at) > self.ttl_seconds
+        return self.expired_at(time.monotonic())
+
+    def expired_at(self, now: float) -> bool:
+        """Whether the cookie is expired at monotonic time now."""
+        return (now - self.stored_at) > self.ttl_seconds
 
 
 class CookieStore:
     def __init__(self):
         self._store: Dict[str, List[StoredCookie]] = {}
 
-    def _key(self, domain: str, proxy_server: Optional[str] = None) -> str:
+    @staticmethod
+    def _key(domain: str, proxy_server: Optional[str] = None) -> str:
         return f"{domain}|{proxy_server or 'direct'}"
 
     async def save_from_context(self, context, domain: str, proxy_server: Optional[str] = None):
-        """Extract Cloudflare cookies from browser context and store them."""
+        """Extract Cloudflare cookies from browser context and store them.
+
+        A context without any Cloudflare cookies leaves the previously stored
+        entry untouched.
+        """
         cookies = await context.cookies()
-        key = self._key(domain, proxy_server)
-        self._store[key] = [
+        new = [
             StoredCookie(
                 name=c["name"],
                 value=c["value"],
@@ -44,17 +52,28 @@ class CookieStore:
                 path=c.get("path", "/"),
             )
             for c in cookies
-            if c.get("name") in _CF_COOKIE_NAMES
+            if c["name"] in _CF_COOKIE_NAMES
         ]
+        if new:
+            self._store[self._key(domain, proxy_server)] = new
 
     async def load_into_context(self, context, domain: str, proxy_server: Optional[str] = None) -> int:
         """Load stored cookies into a fresh browser context. Returns count loaded."""
         key = self._key(domain, proxy_server)
-        stored = self._store.get(key, [])
-        valid = [c for c in stored if not c.is_expired]
+        stored = self._store.get(key)
+        if not stored:
+            return 0
+        now = time.monotonic()
+        valid = [c for c in stored if not c.expired_at(now)]
+        if len(valid) != len(stored):
+            # Drop expired entries now rather than waiting for clear_expired
+            if valid:
+                self._store[key] = valid
+            else:
+                del self._store[key]
         if not valid:
             return 0
-        playwright_cookies = [
+        await context.add_cookies([
             {
                 "name": c.name,
                 "value": c.value,
@@ -64,13 +83,13 @@ class CookieStore:
                 "secure": True,
             }
             for c in valid
-        ]
-        await context.add_cookies(playwright_cookies)
+        ])
         return len(valid)
 
     def clear_expired(self):
+        now = time.monotonic()
         for key in list(self._store):
-            self._store[key] = [c for c in self._store[key] if not c.is_expired]
+            self._store[key] = [c for c in self._store[key] if not c.expired_at(now)]
             if not self._store[key]:
                 del self._store[key]
 
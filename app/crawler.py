@@ -23,6 +23,42 @@ from app.policy.injection import analyze_hidden_prompt_injection
 
 logger = logging.getLogger(__name__)
 
+# Block/challenge phrases (lowercase) in priority order, with the block reason
+# each one reports
+_BLOCK_PHRASES = (
+    ("cloudflare", "cloudflare_challenge"),
+    ("verify your session", "session_verification"),
+    ("captcha", "captcha"),
+    ("access denied", "access_denied"),
+    ("just a moment", "bot_challenge"),
+    ("are you human", "bot_challenge"),
+    ("attention required", "bot_challenge"),
+)
+
+# Error/challenge markers sit near the top of a page (title, headings) or in
+# trailing fallbacks, so phrase scans look at a head+tail window only; this
+# bounds the work on multi-megabyte pages.
+_SCAN_HEAD_CHARS = 65536
+_SCAN_TAIL_CHARS = 8192
+
+
+def _scan_window(text: str) -> str:
+    """The part of *text* that phrase scans look at."""
+    if len(text) <= _SCAN_HEAD_CHARS + _SCAN_TAIL_CHARS:
+        return text
+    return text[:_SCAN_HEAD_CHARS] + text[-_SCAN_TAIL_CHARS:]
+
+
+# Phrases marking an error/placeholder page; any hit caps quality at "minimal".
+# ("page not found" is already covered by "not found".)
+_ERROR_PAGE_SIGNATURES = (
+    "error code: 404",
+    "you've arrived at an empty lot",
+    "not found",
+    "doesn't look like there's anything at this address",
+    "access denied",
+)
+
 
 class CrawlResult:
     """Result of a single URL crawl operation."""
@@ -350,35 +386,27 @@ class CrawlerEngine:
         return ""
 
     def _detect_block_signals(self, html: str, markdown: str, status_code: Optional[int]) -> tuple[bool, str, bool]:
-        combined = f"{html or ''}\n{markdown or ''}".lower()
         html_len = len(html or "")
         markdown_len = len(markdown or "")
         # Real challenge pages are small (<3K HTML). If we have 5K+ HTML or 2K+
         # markdown, block phrases are from boilerplate scripts/headers, not a challenge.
         has_substantial_content = html_len > 5000 or markdown_len > 2000
 
-        patterns = [
-            ("cloudflare", "cloudflare_challenge"),
-            ("verify your session", "session_verification"),
-            ("captcha", "captcha"),
-            ("access denied", "access_denied"),
-            ("just a moment", "bot_challenge"),
-            ("are you human", "bot_challenge"),
-            ("attention required", "bot_challenge"),
-        ]
-
-        for phrase, reason in patterns:
-            if phrase in combined:
-                # Don't flag as blocked when we have substantial content — real challenge
-                # pages are small (<5K HTML). If we have 10K+ chars, the block phrase is
-                # likely from boilerplate scripts/headers, not an actual challenge.
-                if has_substantial_content:
-                    logger.debug(
-                        f"Block phrase '{phrase}' found but page has substantial content "
-                        f"(html={html_len}, md={markdown_len}), not flagging as blocked"
-                    )
-                    continue
-                return True, reason, "captcha" in phrase or "captcha" in combined
+        if not has_substantial_content:
+            combined = f"{html or ''}\n{markdown or ''}".lower()
+            for phrase, reason in _BLOCK_PHRASES:
+                if phrase in combined:
+                    return True, reason, "captcha" in combined
+        elif logger.isEnabledFor(logging.DEBUG):
+            # Substantial pages are never flagged on phrases, so only scan them
+            # when someone is reading the debug log.
+            combined = f"{_scan_window(html or '')}\n{_scan_window(markdown or '')}".lower()
+            found = [phrase for phrase, _ in _BLOCK_PHRASES if phrase in combined]
+            if found:
+                logger.debug(
+                    f"Block phrases {found} found but page has substantial content "
+                    f"(html={html_len}, md={markdown_len}), not flagging as blocked"
+                )
 
         if status_code in {401, 403, 429, 503}:
             # 403 with substantial content = soft-block (page served despite status code)
@@ -421,25 +449,20 @@ class CrawlerEngine:
                     else:
                         return "minimal"
 
-        normalized = (content or "").lower()
-        error_page_signatures = [
-            "error code: 404",
-            "you've arrived at an empty lot",
-            "page not found",
-            "not found",
-            "doesn't look like there's anything at this address",
-            "access denied",
-        ]
-        if any(sig in normalized for sig in error_page_signatures):
-            return "minimal"
-
         # Thin pages should not be treated as sufficient; this catches quiz/header-only pages.
         if body_char_count < 80 or body_word_count < 15:
-            return "empty"
-        if body_char_count < 600 or body_word_count < 120:
+            size_quality = "empty"
+        elif body_char_count < 600 or body_word_count < 120:
+            # An error-page signature would also mean "minimal", so skip the scan
+            return "minimal"
+        else:
+            size_quality = "sufficient"
+
+        normalized = _scan_window(content or "").lower()
+        if any(sig in normalized for sig in _ERROR_PAGE_SIGNATURES):
             return "minimal"
 
-        return "sufficient"
+        return size_quality
 
     def _normalize_url(self, url: str) -> str:
         parsed = urlparse(url)
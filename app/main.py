@@ -94,6 +94,14 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to start browser pool: {e}")
 
+    # Load the challenge solver (and its CapSolver session) now rather than
+    # on the first challenged crawl
+    try:
+        from app.challenge_solver import warm_capsolver_session
+        await warm_capsolver_session()
+    except Exception as e:
+        logger.error(f"Error warming up challenge solver: {e}")
+
     yield
 
     # Shutdown mesh coordinator
@@ -113,6 +121,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error shutting down browser pool: {e}")
 
+    try:
+        from app.challenge_solver import close_capsolver_session
+        await close_capsolver_session()
+    except Exception as e:
+        logger.error(f"Error closing CapSolver session: {e}")
+
     logger.info("Shutting down Grub Crawler service")
 
 
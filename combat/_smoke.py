@@ -4,6 +4,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import asyncio
+import functools
 import time
 import os
 
@@ -12,6 +13,8 @@ os.environ["PYTHONIOENCODING"] = "utf-8"
 URL = "https://example.com"
 BATCH_URLS = [f"https://quotes.toscrape.com/page/{i}/" for i in range(1, 4)]
 
+log = functools.partial(print, flush=True)
+
 
 async def main():
     from combat.adapters.grub import GrubAdapter
@@ -19,53 +22,64 @@ async def main():
     from combat.adapters.scrapy_adapter import ScrapyAdapter
     from combat.adapters.firecrawl import FirecrawlAdapter
 
+    candidates = [
+        ("Grub", GrubAdapter()),
+        ("Crawl4AI", Crawl4AIAdapter()),
+        ("Scrapy", ScrapyAdapter()),
+        ("Firecrawl", FirecrawlAdapter()),
+    ]
+    # Adapters are independent, so set them all up at once
+    outcomes = await asyncio.gather(
+        *[asyncio.wait_for(a.setup(), timeout=30) for _, a in candidates],
+        return_exceptions=True,
+    )
     adapters = []
-    for name, cls in [("Grub", GrubAdapter), ("Crawl4AI", Crawl4AIAdapter), ("Scrapy", ScrapyAdapter), ("Firecrawl", FirecrawlAdapter)]:
-        a = cls()
-        try:
-            await asyncio.wait_for(a.setup(), timeout=30)
+    for (name, a), outcome in zip(candidates, outcomes):
+        if isinstance(outcome, BaseException):
+            log(f"[setup] {name}: skip ({outcome})")
+        else:
             adapters.append(a)
-            print(f"[setup] {name}: ready", flush=True)
-        except Exception as e:
-            print(f"[setup] {name}: skip ({e})", flush=True)
+            log(f"[setup] {name}: ready")
 
-    print(f"\n=== SINGLE URL TEST ===", flush=True)
+    log(f"\n=== SINGLE URL TEST ===")
     for a in adapters:
-        print(f"  [{a.name}] starting crawl_one...", flush=True)
+        log(f"  [{a.name}] starting crawl_one...")
         t0 = time.perf_counter()
         try:
             r = await asyncio.wait_for(a.crawl_one(URL), timeout=30)
-            print(f"  [{a.name}] done {(time.perf_counter()-t0)*1000:.0f}ms success={r.success}", flush=True)
+            log(f"  [{a.name}] done {(time.perf_counter()-t0)*1000:.0f}ms success={r.success}")
         except asyncio.TimeoutError:
-            print(f"  [{a.name}] TIMEOUT after 30s", flush=True)
+            log(f"  [{a.name}] TIMEOUT after 30s")
         except Exception as e:
-            print(f"  [{a.name}] ERROR: {e}", flush=True)
+            log(f"  [{a.name}] ERROR: {e}")
 
-    print(f"\n=== BATCH TEST (3 URLs) ===", flush=True)
+    log(f"\n=== BATCH TEST (3 URLs) ===")
     for a in adapters:
-        print(f"  [{a.name}] starting crawl_batch...", flush=True)
+        log(f"  [{a.name}] starting crawl_batch...")
         t0 = time.perf_counter()
         try:
             results = await asyncio.wait_for(a.crawl_batch(BATCH_URLS, concurrency=3), timeout=90)
             ok = sum(1 for r in results if r.success)
-            print(f"  [{a.name}] done {(time.perf_counter()-t0)*1000:.0f}ms {ok}/{len(results)} ok", flush=True)
+            log(f"  [{a.name}] done {(time.perf_counter()-t0)*1000:.0f}ms {ok}/{len(results)} ok")
         except asyncio.TimeoutError:
-            print(f"  [{a.name}] TIMEOUT after 90s", flush=True)
+            log(f"  [{a.name}] TIMEOUT after 90s")
         except Exception as e:
-            print(f"  [{a.name}] ERROR: {e}", flush=True)
+            log(f"  [{a.name}] ERROR: {e}")
 
-    print(f"\n=== TEARDOWN ===", flush=True)
-    for a in adapters:
-        print(f"  [{a.name}] teardown...", flush=True)
-        try:
-            await asyncio.wait_for(a.teardown(), timeout=15)
-            print(f"  [{a.name}] done", flush=True)
-        except asyncio.TimeoutError:
-            print(f"  [{a.name}] TIMEOUT on teardown", flush=True)
-        except Exception as e:
-            print(f"  [{a.name}] ERROR: {e}", flush=True)
+    log(f"\n=== TEARDOWN ===")
+    outcomes = await asyncio.gather(
+        *[asyncio.wait_for(a.teardown(), timeout=15) for a in adapters],
+        return_exceptions=True,
+    )
+    for a, outcome in zip(adapters, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            log(f"  [{a.name}] TIMEOUT on teardown")
+        elif isinstance(outcome, BaseException):
+            log(f"  [{a.name}] ERROR: {outcome}")
+        else:
+            log(f"  [{a.name}] done")
 
-    print("\n--- finished ---", flush=True)
+    log("\n--- finished ---")
 
 
 if __name__ == "__main__":
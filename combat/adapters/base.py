@@ -1,11 +1,100 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 import re
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from typing import Optional
 
+from selectolax.lexbor import LexborHTMLParser
+
+# httpx only negotiates HTTP/2 when the h2 package is importable
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# JSON parsing for adapter responses: orjson when installed (parses bytes
+# directly, several times faster on large HTML/markdown payloads)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Connection pool size for the HTTP adapters: room for the highest
+# concurrency in the batch sweep (test_batch), so the pool never throttles it
+HTTP_POOL_SIZE = 10
+
+_RE_WORD = re.compile(r"\S+")
+_RE_HEADING = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_RE_MDLINK = re.compile(r"\[.+?\]\(.+?\)")
+
+
+def _visible_text_len(html: str) -> int:
+    """Length of the page's visible text, ignoring script and style content.
+
+    Always parsed with selectolax (a hard requirement) so content_ratio is
+    comparable across environments.
+    """
+    tree = LexborHTMLParser(html)
+    for node in tree.css("script,style"):
+        node.decompose()
+    root = tree.body or tree.root
+    return len((root.text(separator=" ") if root else "").strip())
+
+
+# HTML -> markdown converter: "markdownify" (default) or "html2text_rs", a Rust
+# converter that is much faster but emits reference-style links, which the
+# has_links metric does not count.
+MD_BACKEND = os.environ.get("GRUB_COMBAT_MD_BACKEND", "markdownify")
+
+
+@lru_cache(maxsize=None)
+def _markdownify_converter():
+    """One MarkdownConverter for the session.
+
+    markdownify() builds a converter per call; reusing one skips option
+    setup and keeps its per-tag handler cache warm.  Default options, so
+    output is identical to markdownify(html).
+    """
+    from markdownify import MarkdownConverter
+
+    return MarkdownConverter()
+
+
+def _to_markdown(html: str) -> str:
+    if MD_BACKEND == "html2text_rs":
+        import html2text_rs
+
+        # Wide enough that the converter never re-wraps paragraphs
+        return html2text_rs.text_markdown(html, width=1_000_000)
+    return _markdownify_converter().convert(html)
+
+
+def convert_markdown(html: str) -> str:
+    """Convert *html* to markdown with the configured backend.
+
+    Deliberately uncached: it runs inside each adapter's timed path, and a
+    result reused from another adapter would make its markdown_ms look free.
+    """
+    return _to_markdown(html) if html else ""
+
+
+# Metric values for a result with no markdown (failed or empty crawls)
+_EMPTY_METRICS = {
+    "word_count": 0,
+    "char_count": 0,
+    "has_headings": False,
+    "has_links": False,
+    "content_ratio": 0.0,
+}
+
 
 @dataclass
 class CrawlResult:
@@ -15,31 +104,46 @@ class CrawlResult:
     elapsed_ms: float = 0.0
     success: bool = False
     error: Optional[str] = None
-    word_count: int = 0
-    char_count: int = 0
-    has_headings: bool = False
-    has_links: bool = False
-    content_ratio: float = 0.0
     # Per-phase timing breakdown (adapter-specific, may be empty)
     timings: dict = field(default_factory=dict)
 
+    # Quality metrics are derived from markdown/html on first access, so
+    # results nobody inspects (e.g. batch success counts) never pay for them.
+
+    @cached_property
+    def word_count(self) -> int:
+        return sum(1 for _ in _RE_WORD.finditer(self.markdown)) if self.markdown else 0
+
+    @cached_property
+    def char_count(self) -> int:
+        return len(self.markdown) if self.markdown else 0
+
+    @cached_property
+    def has_headings(self) -> bool:
+        return bool(_RE_HEADING.search(self.markdown)) if self.markdown else False
+
+    @cached_property
+    def has_links(self) -> bool:
+        return bool(_RE_MDLINK.search(self.markdown)) if self.markdown else False
+
+    @cached_property
+    def content_ratio(self) -> float:
+        if not (self.html and self.markdown):
+            return 0.0
+        # Strip tags/scripts/styles to get visible text length.
+        # Raw HTML bytes is an unfair denominator because some adapters
+        # return the full page while others return pre-filtered content.
+        visible_len = _visible_text_len(self.html)
+        return self.char_count / visible_len if visible_len else 0.0
+
     def compute_quality_metrics(self) -> None:
-        """Derive quality metrics from markdown/html content."""
-        self.word_count = len(self.markdown.split()) if self.markdown else 0
-        self.char_count = len(self.markdown) if self.markdown else 0
-        self.has_headings = bool(re.search(r"^#{1,6}\s", self.markdown, re.MULTILINE)) if self.markdown else False
-        self.has_links = bool(re.search(r"\[.+?\]\(.+?\)", self.markdown)) if self.markdown else False
-        if self.html and self.markdown:
-            # Strip tags/scripts/styles to get visible text length.
-            # Raw HTML bytes is an unfair denominator because some adapters
-            # return the full page while others return pre-filtered content.
-            visible = re.sub(r'<script[^>]*>.*?</script>', '', self.html, flags=re.DOTALL | re.IGNORECASE)
-            visible = re.sub(r'<style[^>]*>.*?</style>', '', visible, flags=re.DOTALL | re.IGNORECASE)
-            visible = re.sub(r'<[^>]+>', '', visible)
-            visible_len = len(visible.strip())
-            self.content_ratio = len(self.markdown) / visible_len if visible_len else 0.0
-        else:
-            self.content_ratio = 0.0
+        """Recompute quality metrics now, e.g. after markdown/html changed."""
+        if not self.markdown:
+            self.__dict__.update(_EMPTY_METRICS)
+            return
+        for name in _EMPTY_METRICS:
+            self.__dict__.pop(name, None)
+            getattr(self, name)
 
 
 class CrawlerAdapter(ABC):
@@ -61,19 +165,28 @@ class CrawlerAdapter(ABC):
     async def crawl_batch(self, urls: list[str], *, concurrency: int = 3, timeout: int = 45) -> list[CrawlResult]:
         """Crawl multiple URLs with bounded concurrency.
 
-        Default implementation uses asyncio.Semaphore around crawl_one.
-        Each individual crawl is hard-capped at *timeout* seconds so one
-        stalled page can't block the whole batch.
+        Default implementation runs *concurrency* workers that pull URLs off
+        a shared iterator, so only O(concurrency) tasks are alive however long
+        the batch.  Each individual crawl is hard-capped at *timeout* seconds
+        so one stalled page can't block the whole batch.
         """
-        import asyncio
+        pending = iter(enumerate(urls))
+        results: list = [None] * len(urls)
 
-        sem = asyncio.Semaphore(concurrency)
+        async def _worker() -> None:
+            for i, u in pending:
+                results[i] = await self.crawl_capped(u, timeout)
 
-        async def _bounded(u: str) -> CrawlResult:
-            async with sem:
-                try:
-                    return await asyncio.wait_for(self.crawl_one(u), timeout=timeout)
-                except asyncio.TimeoutError:
-                    return CrawlResult(url=u, elapsed_ms=timeout * 1000, error="timeout")
+        await asyncio.gather(*[_worker() for _ in range(min(concurrency, len(urls)))])
+        return results
 
-        return await asyncio.gather(*[_bounded(u) for u in urls])
+    async def crawl_capped(self, url: str, timeout: int) -> CrawlResult:
+        """crawl_one hard-capped at *timeout* seconds.
+
+        A crawl that runs over comes back as a CrawlResult with error="timeout"
+        instead of raising, so callers can record it like any other failure.
+        """
+        try:
+            return await asyncio.wait_for(self.crawl_one(url), timeout=timeout)
+        except asyncio.TimeoutError:
+            return CrawlResult(url=url, elapsed_ms=timeout * 1000, error="timeout")
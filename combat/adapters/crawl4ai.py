@@ -37,7 +37,6 @@ class Crawl4AIAdapter(CrawlerAdapter):
                 success=bool(getattr(result, "success", True)),
                 error=getattr(result, "error_message", None),
             )
-            cr.compute_quality_metrics()
             return cr
         except Exception as exc:
             elapsed = (time.perf_counter() - t0) * 1000
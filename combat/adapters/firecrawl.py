@@ -5,7 +5,7 @@ import time
 
 import httpx
 
-from combat.adapters.base import CrawlerAdapter, CrawlResult
+from combat.adapters.base import HTTP2_AVAILABLE, HTTP_POOL_SIZE, CrawlerAdapter, CrawlResult
 
 
 class FirecrawlAdapter(CrawlerAdapter):
@@ -33,6 +33,12 @@ class FirecrawlAdapter(CrawlerAdapter):
             base_url=self.base_url,
             timeout=60,
             headers={"Authorization": f"Bearer {self.api_key}"},
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_POOL_SIZE,
+                keepalive_expiry=75,
+            ),
         )
         try:
             resp = await self._client.get("/", timeout=5)
@@ -70,7 +76,6 @@ class FirecrawlAdapter(CrawlerAdapter):
                 success=data.get("success", resp.is_success),
                 error=data.get("error"),
             )
-            cr.compute_quality_metrics()
             return cr
         except Exception as exc:
             elapsed = (time.perf_counter() - t0) * 1000
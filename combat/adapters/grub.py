@@ -1,41 +1,93 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import time
 
 import httpx
 
-from combat.adapters.base import CrawlerAdapter, CrawlResult
+from combat.adapters.base import HTTP2_AVAILABLE, HTTP_POOL_SIZE, CrawlerAdapter, CrawlResult, json_loads
 
 
 class GrubAdapter(CrawlerAdapter):
-    """Adapter for Grub via its POST /api/markdown endpoint."""
+    """Adapter for Grub via its POST /api/markdown endpoint.
+
+    Talks to Grub over httpx by default; set GRUB_COMBAT_HTTP_CLIENT=aiohttp
+    to use an aiohttp session instead (lower per-request client overhead on
+    concurrent batches).
+    """
 
     name = "Grub"
 
     def __init__(self) -> None:
         self.base_url = os.environ.get("GRUB_COMBAT_URL", "http://localhost:6792")
         self.customer_id = os.environ.get("GRUB_COMBAT_CUSTOMER_ID", "combat-bench")
+        self.http_client = os.environ.get("GRUB_COMBAT_HTTP_CLIENT", "httpx")
         self._client: httpx.AsyncClient | None = None
+        self._session = None  # aiohttp.ClientSession when http_client == "aiohttp"
 
     async def setup(self) -> None:
-        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=60)
-        # Verify Grub is reachable
-        resp = await self._client.get("/health")
-        resp.raise_for_status()
+        if self.http_client == "aiohttp":
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                base_url=self.base_url,
+                timeout=aiohttp.ClientTimeout(total=60),
+                connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=120, ttl_dns_cache=300),
+            )
+        else:
+            self._client = self._httpx_client()
+        # Verify Grub is reachable; concurrent probes also pre-open the
+        # keep-alive connections the first crawls will use.
+        await asyncio.gather(*[self._check_health() for _ in range(min(4, HTTP_POOL_SIZE))])
+
+    def _httpx_client(self) -> httpx.AsyncClient:
+        # No transport-level retries: a failed request should show up in the
+        # benchmark rather than be silently re-sent.
+        transport = httpx.AsyncHTTPTransport(
+            retries=0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_POOL_SIZE,
+                keepalive_expiry=120,
+            ),
+        )
+        return httpx.AsyncClient(base_url=self.base_url, timeout=60, transport=transport)
+
+    async def _check_health(self) -> None:
+        if self._session is not None:
+            async with self._session.get("/health") as resp:
+                resp.raise_for_status()
+        else:
+            resp = await self._client.get("/health")
+            resp.raise_for_status()
+
+    async def _post(self, path: str, payload: dict, timeout: float | None = None) -> bytes:
+        """POST *payload* as JSON and return the raw response body."""
+        if self._session is not None:
+            import aiohttp
+
+            kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+            async with self._session.post(path, json=payload, **kwargs) as resp:
+                return await resp.read()
+        kwargs = {"timeout": timeout} if timeout else {}
+        resp = await self._client.post(path, json=payload, **kwargs)
+        return resp.content
 
     async def teardown(self) -> None:
         if self._client:
             await self._client.aclose()
+        if self._session:
+            await self._session.close()
 
     async def crawl_batch(self, urls: list[str], *, concurrency: int = 3, timeout: int = 45) -> list[CrawlResult]:
         """Use Grub's native /api/batch endpoint for fair batch comparison."""
-        assert self._client is not None, "Call setup() first"
-        import time as _time
+        assert self._client is not None or self._session is not None, "Call setup() first"
         payload = {
             "urls": urls,
             "customer_id": self.customer_id,
-            "concurrent": min(concurrency, 3),
+            "concurrent": min(concurrency, 10),  # BatchRequest caps at 10
             "options": {
                 "javascript": True,
                 "timeout": 30,
@@ -44,11 +96,11 @@ class GrubAdapter(CrawlerAdapter):
                 "include_html": True,
             },
         }
-        t0 = _time.perf_counter()
+        t0 = time.perf_counter()
         try:
-            resp = await self._client.post("/api/batch", json=payload, timeout=timeout * len(urls))
-            elapsed = (_time.perf_counter() - t0) * 1000
-            data = resp.json()
+            body = await self._post("/api/batch", payload, timeout=timeout * len(urls))
+            elapsed = (time.perf_counter() - t0) * 1000
+            data = json_loads(body)
             results = []
             for item in data.get("results", []):
                 cr = CrawlResult(
@@ -59,7 +111,6 @@ class GrubAdapter(CrawlerAdapter):
                     success=item.get("success", False),
                     error=item.get("error"),
                 )
-                cr.compute_quality_metrics()
                 results.append(cr)
             # Fill missing URLs with errors
             result_urls = {r.url for r in results}
@@ -68,11 +119,11 @@ class GrubAdapter(CrawlerAdapter):
                     results.append(CrawlResult(url=u, elapsed_ms=elapsed, error="missing from batch response"))
             return results
         except Exception as exc:
-            elapsed = (_time.perf_counter() - t0) * 1000
+            elapsed = (time.perf_counter() - t0) * 1000
             return [CrawlResult(url=u, elapsed_ms=elapsed, error=str(exc)) for u in urls]
 
     async def crawl_one(self, url: str, *, javascript: bool = True, timeout: int = 30) -> CrawlResult:
-        assert self._client is not None, "Call setup() first"
+        assert self._client is not None or self._session is not None, "Call setup() first"
         payload = {
             "url": url,
             "customer_id": self.customer_id,
@@ -86,9 +137,9 @@ class GrubAdapter(CrawlerAdapter):
         }
         t0 = time.perf_counter()
         try:
-            resp = await self._client.post("/api/crawl", json=payload)
+            body = await self._post("/api/crawl", payload)
             elapsed = (time.perf_counter() - t0) * 1000
-            data = resp.json()
+            data = json_loads(body)
 
             # Extract server-side phase timings
             server_timings = data.get("timings_ms", {})
@@ -105,7 +156,6 @@ class GrubAdapter(CrawlerAdapter):
                     **{k: v for k, v in server_timings.items()},
                 },
             )
-            result.compute_quality_metrics()
             return result
         except Exception as exc:
             elapsed = (time.perf_counter() - t0) * 1000
@@ -1,19 +1,46 @@
 from __future__ import annotations
 
+import asyncio
 import time
 
-from combat.adapters.base import CrawlerAdapter, CrawlResult
+from combat.adapters.base import CrawlerAdapter, CrawlResult, convert_markdown
+
+
+# Subresources the HTML -> markdown path never looks at
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+
+async def _block_subresources(route) -> None:
+    """Route handler: abort blocked subresources, let everything else through."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _ms(ns: int) -> float:
+    """Nanosecond interval -> milliseconds, rounded for the report."""
+    return round(ns / 1_000_000, 1)
 
 
 class PlaywrightRawAdapter(CrawlerAdapter):
     """Baseline adapter using raw Playwright — no extraction pipeline.
 
-    Shows what Grub adds on top of bare browser automation.
+    Shows what Grub adds on top of bare browser automation.  Every crawl
+    gets a fresh browser context, so no cookies, storage or cache carry over
+    from one URL to the next.  Concurrency is whatever the caller runs
+    (crawl_batch's *concurrency*); the adapter adds no cap of its own.
+
+    By default images, media, fonts and stylesheets are aborted, so
+    navigation only waits on the document and its scripts.  Extracted
+    content is unchanged, but this is leaner than a stock browser; pass
+    ``block_subresources=False`` to race an unmodified one.
     """
 
     name = "PW Raw"
 
-    def __init__(self) -> None:
+    def __init__(self, block_subresources: bool = True) -> None:
+        self.block_subresources = block_subresources
         self._pw = None
         self._browser = None
 
@@ -31,23 +58,26 @@ class PlaywrightRawAdapter(CrawlerAdapter):
 
     async def crawl_one(self, url: str, *, javascript: bool = True, timeout: int = 30) -> CrawlResult:
         assert self._browser is not None, "Call setup() first"
-        from markdownify import markdownify as md
-
-        page = None
-        t0 = time.perf_counter()
+        ctx = None
+        # Phase stamps are integer ns; converted to ms once, below
+        t0 = time.perf_counter_ns()
         try:
-            page = await self._browser.new_page()
-            t_nav_start = time.perf_counter()
+            ctx = await self._browser.new_context()
+            if self.block_subresources:
+                await ctx.route("**/*", _block_subresources)
+            page = await ctx.new_page()
+            t_nav_start = time.perf_counter_ns()
             await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
-            t_nav_end = time.perf_counter()
+            t_nav_end = time.perf_counter_ns()
 
             html = await page.content()
-            t_content = time.perf_counter()
+            t_content = time.perf_counter_ns()
 
-            markdown = md(html) if html else ""
-            t_md = time.perf_counter()
+            # markdownify is synchronous; keep the loop free for other slots
+            markdown = await asyncio.get_running_loop().run_in_executor(None, convert_markdown, html)
+            t_md = time.perf_counter_ns()
 
-            elapsed = (t_md - t0) * 1000
+            elapsed = (t_md - t0) / 1_000_000
             cr = CrawlResult(
                 url=url,
                 markdown=markdown,
@@ -55,17 +85,18 @@ class PlaywrightRawAdapter(CrawlerAdapter):
                 elapsed_ms=elapsed,
                 success=bool(html),
                 timings={
-                    "navigation_ms": round((t_nav_end - t_nav_start) * 1000, 1),
-                    "content_ms": round((t_content - t_nav_end) * 1000, 1),
-                    "markdown_ms": round((t_md - t_content) * 1000, 1),
-                    "total_ms": round(elapsed, 1),
+                    "navigation_ms": _ms(t_nav_end - t_nav_start),
+                    "content_ms": _ms(t_content - t_nav_end),
+                    "markdown_ms": _ms(t_md - t_content),
+                    "total_ms": _ms(t_md - t0),
                 },
             )
-            cr.compute_quality_metrics()
             return cr
         except Exception as exc:
-            elapsed = (time.perf_counter() - t0) * 1000
+            elapsed = (time.perf_counter_ns() - t0) / 1_000_000
             return CrawlResult(url=url, elapsed_ms=elapsed, error=str(exc))
         finally:
-            if page:
-                await page.close()
+            # Closing the context closes its page and drops its cookies,
+            # storage and cache
+            if ctx:
+                await ctx.close()
@@ -1,78 +1,178 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import sys
 import time
 import textwrap
 
-from combat.adapters.base import CrawlerAdapter, CrawlResult
+from combat.adapters.base import CrawlerAdapter, CrawlResult, convert_markdown, json_loads
 
-# Scrapy's Twisted reactor can only start once per process.  We shell out
-# to a tiny helper script in a subprocess so every crawl gets a fresh reactor.
+# Scrapy's Twisted reactor can only start once per process, so crawls run in a
+# helper subprocess.  The helper is long-lived: it starts one reactor and one
+# CrawlerRunner, reads {"id", "url", "timeout"} jobs as JSON lines on stdin and
+# answers each with one {"id", "html", "status"} (or {"id", "error"}) JSON line
+# on stdout.  Interpreter and reactor startup are paid once per adapter rather
+# than once per URL, and several jobs can be in flight at a time.
 
-_HELPER_SCRIPT = textwrap.dedent("""\
+_WORKER_SCRIPT = textwrap.dedent("""\
     import json, sys, scrapy
-    from scrapy.crawler import CrawlerProcess
-
-    url, timeout = sys.argv[1], int(sys.argv[2])
-    collected = {}
+    try:
+        import orjson
+        def encode(msg):
+            return orjson.dumps(msg) + b"\\n"
+    except ImportError:
+        def encode(msg):
+            return (json.dumps(msg) + "\\n").encode()
+    from scrapy.utils.reactor import install_reactor
+    install_reactor("twisted.internet.asyncioreactor.AsyncioSelectorReactor")
+    from twisted.internet import reactor
+    from scrapy.crawler import CrawlerRunner
 
     class S(scrapy.Spider):
         name = "c"
-        start_urls = [url]
         custom_settings = {
-            "DOWNLOAD_TIMEOUT": timeout,
             "LOG_ENABLED": False,
             "ROBOTSTXT_OBEY": False,
             "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
         }
         def parse(self, response):
-            collected["html"] = response.text
-            collected["status"] = response.status
-
-    p = CrawlerProcess({"LOG_ENABLED": False, "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7"})
-    p.crawl(S)
-    p.start()
-    json.dump(collected, sys.stdout)
+            self.collected["html"] = response.text
+            self.collected["status"] = response.status
+
+    runner = CrawlerRunner({"LOG_ENABLED": False, "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7"})
+
+    def reply(msg):
+        sys.stdout.buffer.write(encode(msg))
+        sys.stdout.buffer.flush()
+
+    def start(line):
+        job = json.loads(line)
+        collected = {}
+        d = runner.crawl(S, start_urls=[job["url"]], download_timeout=job["timeout"], collected=collected)
+        d.addCallback(lambda _: reply({"id": job["id"], **collected}))
+        d.addErrback(lambda f: reply({"id": job["id"], "error": str(f.value)}))
+
+    def read_jobs():
+        for line in sys.stdin:
+            if line.strip():
+                reactor.callFromThread(start, line)
+        # stdin closed: let in-flight crawls finish, then exit
+        reactor.callFromThread(lambda: runner.join().addBoth(lambda _: reactor.stop()))
+
+    reactor.callInThread(read_jobs)
+    reactor.run()
 """)
 
+# Responses carry whole pages on one line; raise the StreamReader line limit
+_WORKER_LINE_LIMIT = 64 * 1024 * 1024
+
 
 class ScrapyAdapter(CrawlerAdapter):
     """Adapter for Scrapy — HTTP-only (no JS rendering).
 
     Demonstrates the content gap when JavaScript rendering is absent.
-    Each crawl runs in a subprocess to avoid Twisted reactor issues.
+    Crawls run in one long-lived worker subprocess to avoid Twisted reactor
+    issues; if the worker dies, the next crawl starts a new one.
     """
 
     name = "Scrapy"
 
+    def __init__(self) -> None:
+        self._proc: asyncio.subprocess.Process | None = None
+        self._reader: asyncio.Task | None = None
+        # Reply map of the live worker; None once it has died
+        self._pending: dict[int, asyncio.Future] | None = None
+        self._next_id = 0
+        self._spawn_lock = asyncio.Lock()
+
     async def setup(self) -> None:
         import scrapy  # noqa: F401 — verify importable
         import markdownify  # noqa: F401
 
+        await self._start_worker()
+
+    async def _start_worker(self) -> None:
+        """Spawn the worker subprocess and the task reading its replies."""
+        self._proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", _WORKER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=_WORKER_LINE_LIMIT,
+        )
+        # Each worker gets its own reply map, so a dying worker only fails
+        # the calls that were waiting on it
+        self._pending = {}
+        self._reader = asyncio.create_task(self._read_replies(self._proc, self._pending))
+
+    def _worker_alive(self) -> bool:
+        return self._pending is not None
+
     async def teardown(self) -> None:
-        pass
+        if self._proc:
+            self._proc.stdin.close()
+            try:
+                await asyncio.wait_for(self._proc.wait(), timeout=15)
+            except asyncio.TimeoutError:
+                self._proc.kill()
+                await self._proc.wait()
+        if self._reader:
+            await self._reader
+
+    async def _read_replies(self, proc: asyncio.subprocess.Process, pending: dict[int, asyncio.Future]) -> None:
+        """Route worker replies to the crawl_one call waiting on their id.
+
+        However the reader stops (worker exit, unreadable reply), every call
+        still waiting is failed at once and the worker is killed, so callers
+        don't sit out their timeouts and the next crawl_one respawns it.
+        """
+        reason = "scrapy worker exited"
+        try:
+            async for line in proc.stdout:
+                msg = json_loads(line)
+                fut = pending.pop(msg.get("id"), None)
+                if fut and not fut.done():
+                    fut.set_result(msg)
+        except Exception as exc:
+            reason = f"scrapy worker reply unreadable: {exc}"
+        finally:
+            if self._pending is pending:
+                self._pending = None  # dead: the next crawl_one respawns
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_exception(RuntimeError(reason))
+            pending.clear()
+            if proc.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    proc.kill()
+                await proc.wait()
 
     async def crawl_one(self, url: str, *, javascript: bool = True, timeout: int = 30) -> CrawlResult:
-        from markdownify import markdownify as md
-
+        assert self._proc is not None, "Call setup() first"
         t0 = time.perf_counter()
+        if not self._worker_alive():
+            async with self._spawn_lock:
+                if not self._worker_alive():
+                    await self._start_worker()
+        proc, pending = self._proc, self._pending
+        self._next_id += 1
+        job_id = self._next_id
+        fut = asyncio.get_running_loop().create_future()
+        pending[job_id] = fut
         try:
-            proc = await asyncio.create_subprocess_exec(
-                sys.executable, "-c", _HELPER_SCRIPT, url, str(timeout),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout + 10)
+            job = {"id": job_id, "url": url, "timeout": timeout}
+            proc.stdin.write(json.dumps(job).encode() + b"\n")
+            await proc.stdin.drain()
+            collected = await asyncio.wait_for(fut, timeout=timeout + 10)
             elapsed = (time.perf_counter() - t0) * 1000
 
-            if proc.returncode != 0:
-                return CrawlResult(url=url, elapsed_ms=elapsed, error=stderr.decode(errors="replace")[:500])
+            if "error" in collected:
+                return CrawlResult(url=url, elapsed_ms=elapsed, error=collected["error"][:500])
 
-            collected = json.loads(stdout.decode())
             html = collected.get("html", "")
-            markdown = md(html) if html else ""
+            markdown = convert_markdown(html)
             cr = CrawlResult(
                 url=url,
                 markdown=markdown,
@@ -80,8 +180,9 @@ class ScrapyAdapter(CrawlerAdapter):
                 elapsed_ms=elapsed,
                 success=bool(html),
             )
-            cr.compute_quality_metrics()
             return cr
         except Exception as exc:
             elapsed = (time.perf_counter() - t0) * 1000
             return CrawlResult(url=url, elapsed_ms=elapsed, error=str(exc))
+        finally:
+            pending.pop(job_id, None)
@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import pathlib
 import random
+from urllib.parse import urlsplit
 
 import pytest
 import pytest_asyncio
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
+# pytest-asyncio 1.4 replaced the event_loop_policy fixture override with the
+# pytest_asyncio_loop_factories hook; older versions only know the fixture.
+_HAS_LOOP_FACTORIES = tuple(int(p) for p in pytest_asyncio.__version__.split(".")[:2]) >= (1, 4)
+
 # ---------------------------------------------------------------------------
 # URL lists
 # ---------------------------------------------------------------------------
@@ -23,6 +39,11 @@ QUALITY_URLS = SPEED_URLS  # same set, different metrics
 
 BATCH_URLS = [f"https://quotes.toscrape.com/page/{i}/" for i in range(1, 51)]
 
+# Parsed once at import: results key ("host/path") and test id ("host") per URL
+_split = {u: urlsplit(u) for u in SPEED_URLS + QUALITY_URLS}
+URL_KEYS = {u: (p.netloc + p.path).rstrip("/") for u, p in _split.items()}
+URL_IDS = {u: p.netloc for u, p in _split.items()}
+
 # ---------------------------------------------------------------------------
 # Shared results collector
 # ---------------------------------------------------------------------------
@@ -39,7 +60,30 @@ def pytest_configure(config):
 def pytest_sessionfinish(session, exitstatus):
     """Dump collected results to JSON after the run."""
     if _combat_results["speed"] or _combat_results["quality"] or _combat_results["batch"]:
-        RESULTS_PATH.write_text(json.dumps(_combat_results, indent=2, default=str))
+        if orjson is not None:
+            RESULTS_PATH.write_bytes(orjson.dumps(
+                _combat_results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                default=str,
+            ))
+        else:
+            RESULTS_PATH.write_text(json.dumps(_combat_results, indent=2, default=str))
+
+
+if _HAS_LOOP_FACTORIES:
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run the suite on uvloop when it is installed."""
+        if uvloop is not None:
+            return {"uvloop": uvloop.new_event_loop}
+        return {"asyncio": asyncio.new_event_loop}
+else:
+    @pytest.fixture(scope="session")
+    def event_loop_policy():
+        """Run the suite on uvloop when it is installed."""
+        if uvloop is not None:
+            return uvloop.EventLoopPolicy()
+        return asyncio.DefaultEventLoopPolicy()
 
 
 @pytest.fixture(scope="session")
@@ -48,6 +92,16 @@ def combat_results():
     return _combat_results
 
 
+@pytest.fixture(scope="session")
+def crawl_cache():
+    """Full CrawlResults from earlier tests, keyed by (adapter name, url).
+
+    Lets later tests (quality) derive their metrics from a crawl the speed
+    test already made instead of hitting the site again.
+    """
+    return {}
+
+
 # ---------------------------------------------------------------------------
 # Adapter fixtures
 # ---------------------------------------------------------------------------
@@ -66,14 +120,16 @@ async def adapters():
         FirecrawlAdapter(),
         ScrapyAdapter(),
     ]
+    # Set adapters up concurrently: cold start costs the slowest setup
+    # (usually a browser launch) rather than the sum of them all.
+    outcomes = await asyncio.gather(*[a.setup() for a in candidates], return_exceptions=True)
     available: list = []
-    for adapter in candidates:
-        try:
-            await adapter.setup()
+    for adapter, exc in zip(candidates, outcomes):
+        if isinstance(exc, BaseException):
+            print(f"  [combat] {adapter.name}: skipped ({exc})")
+        else:
             available.append(adapter)
             print(f"  [combat] {adapter.name}: ready")
-        except Exception as exc:
-            print(f"  [combat] {adapter.name}: skipped ({exc})")
 
     if not available:
         pytest.skip("No crawl adapters available")
@@ -87,11 +143,7 @@ async def adapters():
 
     yield available
 
-    for adapter in available:
-        try:
-            await adapter.teardown()
-        except Exception:
-            pass
+    await asyncio.gather(*[a.teardown() for a in available], return_exceptions=True)
 
 
 @pytest.fixture(scope="session")
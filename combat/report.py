@@ -9,6 +9,7 @@ from __future__ import annotations
 import json
 import pathlib
 import sys
+from collections import Counter
 
 from tabulate import tabulate
 
@@ -40,6 +41,22 @@ def _winner(row: dict, metric: str, lower_is_better: bool = True) -> str:
     return best_name or "-"
 
 
+def _winners(section: dict, metric: str, lower_is_better: bool = True) -> dict[str, str]:
+    """Map each race key in *section* to its winner for *metric*."""
+    return {key: _winner(row, metric, lower_is_better) for key, row in section.items()}
+
+
+def _row_cells(section: dict, adapters: list[str]) -> dict[str, tuple[dict, ...]]:
+    """Map each race key to its adapters' data dicts, in *adapters* order."""
+    return {key: tuple(row.get(a, {}) for a in adapters) for key, row in section.items()}
+
+
+def _score_row(label: str, winners: dict[str, str], adapters: list[str]) -> list[str]:
+    """Scorecard row: races won out of races run, per adapter."""
+    counts = Counter(winners.values())
+    return [label] + [f"{counts[a]}/{len(winners)}" for a in adapters]
+
+
 def _adapters_from(data: dict) -> list[str]:
     """Collect all adapter names seen in any section."""
     names: set[str] = set()
@@ -76,8 +93,16 @@ def print_report(data: dict) -> None:
     print("=" * 72)
     print(f"  Adapters: {', '.join(adapters)}")
 
-    wins = {a: 0 for a in adapters}
-    total_races = 0
+    # Winners per race, computed once for both the tables and the scorecard
+    speed_winners = _winners(data.get("speed", {}), "elapsed_ms", lower_is_better=True)
+    batch_winners = _winners(data.get("batch", {}), "total_ms", lower_is_better=True)
+    word_winners = _winners(data.get("quality", {}), "word_count", lower_is_better=False)
+    ratio_winners = _winners(data.get("quality", {}), "content_ratio", lower_is_better=False)
+
+    # Each row's adapter dicts resolved once, shared by every table on a section
+    speed_cells = _row_cells(data.get("speed", {}), adapters)
+    quality_cells = _row_cells(data.get("quality", {}), adapters)
+    batch_cells = _row_cells(data.get("batch", {}), adapters)
 
     # --- Speed ---
     if data.get("speed"):
@@ -86,14 +111,9 @@ def print_report(data: dict) -> None:
         print("-" * 72)
         headers = ["URL"] + adapters + ["Winner"]
         rows = []
-        for url_key, row in data["speed"].items():
-            short = url_key[:35]
-            cells = [_fmt(row.get(a, {}).get("elapsed_ms")) for a in adapters]
-            winner = _winner(row, "elapsed_ms", lower_is_better=True)
-            if winner in wins:
-                wins[winner] += 1
-            total_races += 1
-            rows.append([short] + cells + [winner])
+        for url_key, cells in speed_cells.items():
+            winner = speed_winners[url_key]
+            rows.append([url_key[:35]] + [_fmt(d.get("elapsed_ms")) for d in cells] + [winner])
         print(tabulate(rows, headers=headers, tablefmt="grid", numalign="right"))
 
         # Phase breakdown for Grub
@@ -127,11 +147,9 @@ def print_report(data: dict) -> None:
         print("-" * 72)
         headers = ["URL"] + adapters + ["Winner"]
         rows = []
-        for url_key, row in data["quality"].items():
-            short = url_key[:35]
-            cells = [_fmt(row.get(a, {}).get("word_count")) for a in adapters]
-            winner = _winner(row, "word_count", lower_is_better=False)
-            rows.append([short] + cells + [winner])
+        for url_key, cells in quality_cells.items():
+            winner = word_winners[url_key]
+            rows.append([url_key[:35]] + [_fmt(d.get("word_count")) for d in cells] + [winner])
         print(tabulate(rows, headers=headers, tablefmt="grid", numalign="right"))
 
         # --- Quality: content ratio ---
@@ -140,11 +158,9 @@ def print_report(data: dict) -> None:
         print("-" * 72)
         headers = ["URL"] + adapters + ["Winner"]
         rows = []
-        for url_key, row in data["quality"].items():
-            short = url_key[:35]
-            cells = [_fmt(row.get(a, {}).get("content_ratio"), ".3f") for a in adapters]
-            winner = _winner(row, "content_ratio", lower_is_better=False)
-            rows.append([short] + cells + [winner])
+        for url_key, cells in quality_cells.items():
+            winner = ratio_winners[url_key]
+            rows.append([url_key[:35]] + [_fmt(d.get("content_ratio"), ".3f") for d in cells] + [winner])
         print(tabulate(rows, headers=headers, tablefmt="grid", numalign="right"))
 
     # --- Batch ---
@@ -154,13 +170,10 @@ def print_report(data: dict) -> None:
         print("-" * 72)
         headers = ["Batch"] + [f"{a} (ms)" for a in adapters] + [f"{a} (%ok)" for a in adapters] + ["Winner"]
         rows = []
-        for size_key, row in data["batch"].items():
-            ms_cells = [_fmt(row.get(a, {}).get("total_ms")) for a in adapters]
-            ok_cells = [_fmt(row.get(a, {}).get("success_rate"), ".0%") if row.get(a, {}).get("success_rate") is not None else "-" for a in adapters]
-            winner = _winner(row, "total_ms", lower_is_better=True)
-            if winner in wins:
-                wins[winner] += 1
-            total_races += 1
+        for size_key, cells in batch_cells.items():
+            ms_cells = [_fmt(d.get("total_ms")) for d in cells]
+            ok_cells = [_fmt(d.get("success_rate"), ".0%") for d in cells]
+            winner = batch_winners[size_key]
             rows.append([size_key] + ms_cells + ok_cells + [winner])
         print(tabulate(rows, headers=headers, tablefmt="grid", numalign="right"))
 
@@ -170,9 +183,8 @@ def print_report(data: dict) -> None:
         print("-" * 72)
         headers = ["Batch"] + adapters
         rows = []
-        for size_key, row in data["batch"].items():
-            cells = [_fmt(row.get(a, {}).get("per_url_ms")) for a in adapters]
-            rows.append([size_key] + cells)
+        for size_key, cells in batch_cells.items():
+            rows.append([size_key] + [_fmt(d.get("per_url_ms")) for d in cells])
         print(tabulate(rows, headers=headers, tablefmt="grid", numalign="right"))
 
     # --- Scorecard ---
@@ -183,38 +195,13 @@ def print_report(data: dict) -> None:
 
     score_rows = []
 
-    # Speed wins
     if data.get("speed"):
-        n = len(data["speed"])
-        cells = []
-        for a in adapters:
-            count = sum(1 for row in data["speed"].values() if _winner(row, "elapsed_ms", True) == a)
-            cells.append(f"{count}/{n}")
-        score_rows.append(["Speed (single URL)"] + cells)
-
-    # Batch wins
+        score_rows.append(_score_row("Speed (single URL)", speed_winners, adapters))
     if data.get("batch"):
-        n = len(data["batch"])
-        cells = []
-        for a in adapters:
-            count = sum(1 for row in data["batch"].values() if _winner(row, "total_ms", True) == a)
-            cells.append(f"{count}/{n}")
-        score_rows.append(["Batch throughput"] + cells)
-
-    # Quality word count wins
+        score_rows.append(_score_row("Batch throughput", batch_winners, adapters))
     if data.get("quality"):
-        n = len(data["quality"])
-        cells = []
-        for a in adapters:
-            count = sum(1 for row in data["quality"].values() if _winner(row, "word_count", False) == a)
-            cells.append(f"{count}/{n}")
-        score_rows.append(["Quality (words)"] + cells)
-
-        cells = []
-        for a in adapters:
-            count = sum(1 for row in data["quality"].values() if _winner(row, "content_ratio", False) == a)
-            cells.append(f"{count}/{n}")
-        score_rows.append(["Quality (ratio)"] + cells)
+        score_rows.append(_score_row("Quality (words)", word_winners, adapters))
+        score_rows.append(_score_row("Quality (ratio)", ratio_winners, adapters))
 
     if score_rows:
         print(tabulate(score_rows, headers=["Category"] + adapters, tablefmt="grid", stralign="center"))
@@ -8,9 +8,15 @@ import pytest
 
 @pytest.mark.combat
 @pytest.mark.asyncio(loop_scope="session")
+# Grub's /api/batch caps concurrency at 10, so stay below it to keep every
+# adapter running at the labelled concurrency
+@pytest.mark.parametrize("concurrency", [3, 8])
 @pytest.mark.parametrize("batch_size", [10, 25, 50])
-async def test_batch_throughput(adapters, combat_results, batch_urls, batch_size):
-    """Race adapters on a batch of URLs with concurrency=3.
+async def test_batch_throughput(adapters, combat_results, batch_urls, batch_size, concurrency):
+    """Race adapters on a batch of URLs at the given concurrency.
+
+    Sweeping concurrency shows where per_url_ms stops improving, i.e. where
+    each adapter (or the target site) saturates.
 
     Metrics:
       - total_ms: wall-clock time for the full batch
@@ -23,7 +29,7 @@ async def test_batch_throughput(adapters, combat_results, batch_urls, batch_size
 
     for adapter in adapters:
         t0 = time.perf_counter()
-        results = await adapter.crawl_batch(urls, concurrency=3)
+        results = await adapter.crawl_batch(urls, concurrency=concurrency)
         total_ms = (time.perf_counter() - t0) * 1000
 
         successes = [r for r in results if r.success]
@@ -34,7 +40,7 @@ async def test_batch_throughput(adapters, combat_results, batch_urls, batch_size
             "total_words": sum(r.word_count for r in successes),
         }
 
-    combat_results["batch"][str(batch_size)] = row
+    combat_results["batch"][f"{batch_size} @ c{concurrency}"] = row
 
     parts = [f"{name}: {d['total_ms']:.0f}ms ({d['success_rate']:.0%})" for name, d in row.items()]
-    print(f"  batch={batch_size}  ->  {' | '.join(parts)}")
+    print(f"  batch={batch_size} concurrency={concurrency}  ->  {' | '.join(parts)}")
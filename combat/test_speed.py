@@ -5,8 +5,7 @@ import asyncio
 
 import pytest
 
-from combat.adapters.base import CrawlResult
-from combat.conftest import SPEED_URLS
+from combat.conftest import SPEED_URLS, URL_IDS, URL_KEYS
 
 CRAWL_TIMEOUT = 45  # seconds — hard cap per adapter per URL
 INTER_ADAPTER_DELAY = 10  # seconds between adapter runs to avoid rate-limiting
@@ -14,8 +13,8 @@ INTER_ADAPTER_DELAY = 10  # seconds between adapter runs to avoid rate-limiting
 
 @pytest.mark.combat
 @pytest.mark.asyncio(loop_scope="session")
-@pytest.mark.parametrize("url", SPEED_URLS, ids=[u.split("//")[1].split("/")[0] for u in SPEED_URLS])
-async def test_single_url_speed(adapters, combat_results, url):
+@pytest.mark.parametrize("url", SPEED_URLS, ids=[URL_IDS[u] for u in SPEED_URLS])
+async def test_single_url_speed(adapters, combat_results, crawl_cache, url):
     """Race every available adapter on a single URL.
 
     No assertions — this is data-collection only.  Results are stored in
@@ -25,16 +24,14 @@ async def test_single_url_speed(adapters, combat_results, url):
     Grub always runs first (baseline).  Remaining adapters run in shuffled
     order with a delay between each to avoid rate-limiting.
     """
-    url_key = url.split("//")[1].rstrip("/")
+    url_key = URL_KEYS[url]
     row: dict = {}
 
     for i, adapter in enumerate(adapters):
         if i > 0:
             await asyncio.sleep(INTER_ADAPTER_DELAY)
-        try:
-            result = await asyncio.wait_for(adapter.crawl_one(url), timeout=CRAWL_TIMEOUT)
-        except asyncio.TimeoutError:
-            result = CrawlResult(url=url, elapsed_ms=CRAWL_TIMEOUT * 1000, error="timeout")
+        result = await adapter.crawl_capped(url, CRAWL_TIMEOUT)
+        crawl_cache[(adapter.name, url)] = result
         row[adapter.name] = {
             "elapsed_ms": round(result.elapsed_ms, 1),
             "success": result.success,
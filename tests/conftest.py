@@ -1,6 +1,18 @@
 """Shared fixtures and markers for grub-crawl test suite."""
 
+import asyncio
+
 import pytest
+import pytest_asyncio
+
+try:
+    import uvloop  # installed with uvicorn[standard]
+except ImportError:  # not available on Windows
+    uvloop = None
+
+# pytest-asyncio 1.4 replaced the event_loop_policy fixture override with the
+# pytest_asyncio_loop_factories hook; older versions only know the fixture.
+_HAS_LOOP_FACTORIES = tuple(int(p) for p in pytest_asyncio.__version__.split(".")[:2]) >= (1, 4)
 
 # Standalone CLI scripts that use argparse/gnosis_registry — not pytest tests
 collect_ignore = ["test_simple.py", "test_batch_crawl.py", "test_screenshot_api.py"]
@@ -9,3 +21,19 @@ collect_ignore = ["test_simple.py", "test_batch_crawl.py", "test_screenshot_api.
 def pytest_configure(config):
     config.addinivalue_line("markers", "remote: marks tests that hit a deployed API (deselect with '-m \"not remote\"')")
     config.addinivalue_line("markers", "slow: marks slow tests")
+
+
+if _HAS_LOOP_FACTORIES:
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop when it is installed."""
+        if uvloop is not None:
+            return {"uvloop": uvloop.new_event_loop}
+        return {"asyncio": asyncio.new_event_loop}
+else:
+    @pytest.fixture(scope="session")
+    def event_loop_policy():
+        """Run async tests on uvloop when it is installed."""
+        if uvloop is not None:
+            return uvloop.EventLoopPolicy()
+        return asyncio.DefaultEventLoopPolicy()
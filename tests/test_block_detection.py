@@ -1,5 +1,5 @@
 """
-Tests for _detect_block_signals in CrawlerEngine.
+Tests for _detect_block_signals and _classify_content_quality in CrawlerEngine.
 
 Verifies that block phrases (e.g. "just a moment", "cloudflare") in HTML/markdown
 do NOT trigger a false-positive block when the page has real content.
@@ -16,9 +16,12 @@ from unittest.mock import MagicMock
 from app.crawler import CrawlerEngine
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def handler():
-    """Create a minimal CrawlerEngine for unit-testing _detect_block_signals."""
+    """Create a minimal CrawlerEngine for unit-testing _detect_block_signals.
+
+    Module-scoped: the method under test never writes to ``self``.
+    """
     return CrawlerEngine.__new__(CrawlerEngine)
 
 
@@ -107,3 +110,43 @@ class TestDetectBlockSignals:
         html = "<html><body>Welcome to our product reviews</body></html>"
         blocked, reason, captcha = handler._detect_block_signals(html, "", 200)
         assert blocked is False
+
+    def test_reason_follows_phrase_priority(self, handler):
+        """The highest-priority phrase names the reason; captcha is still flagged."""
+        html = "<html><body>Just a moment... solve the captcha (Cloudflare)</body></html>"
+        blocked, reason, captcha = handler._detect_block_signals(html, "", None)
+        assert blocked is True
+        assert reason == "cloudflare_challenge"
+        assert captcha is True
+
+    def test_substantial_markdown_skips_phrases_but_keeps_status(self, handler):
+        """Phrases are ignored on substantial pages, but a 429 still blocks."""
+        markdown = "Attention required. " + "Real article text. " * 200
+        blocked, reason, captcha = handler._detect_block_signals("", markdown, 429)
+        assert blocked is True
+        assert reason == "http_429"
+        assert captcha is False
+
+
+class TestClassifyContentQuality:
+    """Content quality labels, including the bounded error-signature scan."""
+
+    def test_error_signature_near_top_is_minimal(self, handler):
+        content = "# Page not found\n\n" + "Some filler text here. " * 10000
+        quality = handler._classify_content_quality(len(content), 40000, False, 200, content)
+        assert quality == "minimal"
+
+    def test_error_signature_in_trailing_window_is_minimal(self, handler):
+        content = "Some filler text here. " * 10000 + "\n\nAccess denied"
+        quality = handler._classify_content_quality(len(content), 40000, False, 200, content)
+        assert quality == "minimal"
+
+    def test_signature_deep_in_huge_page_is_ignored(self, handler):
+        filler = "Some filler text here. " * 5000
+        content = filler + "the file was not found in the archive" + filler
+        quality = handler._classify_content_quality(len(content), 40000, False, 200, content)
+        assert quality == "sufficient"
+
+    def test_mid_size_page_is_minimal(self, handler):
+        content = "word " * 100
+        assert handler._classify_content_quality(500, 100, False, 200, content) == "minimal"
@@ -12,41 +12,88 @@ from app.challenge_solver import (
     CHALLENGE_SELECTORS,
     CHALLENGE_TITLE_PATTERNS,
     RESOLVED_SELECTORS,
+    _PAGE_PROBE_JS,
+    _SITEKEY_PROBE_JS,
     detect_challenge,
     wait_for_challenge_resolution,
     solve_turnstile_capsolver,
     resolve_challenge,
     _extract_turnstile_sitekey,
+    _block_heavy_assets,
 )
 
 
 # --- Fixtures ---
 
 
-def make_page(title="My Site", selectors=None, resolved_selectors=None):
+class FakeClock:
+    """Stands in for challenge_solver's time module; waits advance it instead of sleeping."""
+
+    def __init__(self):
+        self.ns = 0
+
+    def monotonic_ns(self):
+        return self.ns
+
+    def advance(self, ms):
+        self.ns += int(ms * 1_000_000)
+
+
+_clock = FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def virtual_clock(monkeypatch):
+    """Run the solver's elapsed/timeout bookkeeping on _clock."""
+    monkeypatch.setattr("app.challenge_solver.time", _clock)
+    return _clock
+
+
+def make_page(title="My Site", selectors=None, resolved_selectors=None, content=""):
     """Create a mock Playwright page with configurable challenge indicators."""
     page = AsyncMock()
     page.title = AsyncMock(return_value=title)
 
-    # Map of selector -> mock element
-    element_map = {}
-    if selectors:
-        for selector, visible in selectors.items():
-            el = AsyncMock()
-            el.is_visible = AsyncMock(return_value=visible)
-            el.get_attribute = AsyncMock(return_value=None)
-            element_map[selector] = el
-
-    if resolved_selectors:
-        for selector in resolved_selectors:
-            el = AsyncMock()
-            element_map[selector] = el
-
-    async def query_selector(sel):
-        return element_map.get(sel)
-
-    page.query_selector = AsyncMock(side_effect=query_selector)
-    page.evaluate = AsyncMock(return_value=None)
+    selectors = selectors or {}
+    resolved_selectors = resolved_selectors or []
+
+    def signal_hits(signals, max_len, need):
+        if not content or len(content) >= max_len:
+            return None
+        lower = content.lower()
+        return [s for s in signals if s in lower][:need]
+
+    def challenge_hit(challenge_selectors):
+        # Like the probe: first selector in list order with a match, whatever
+        # the document order of the elements
+        for selector, challenge_type in challenge_selectors:
+            if selector in selectors:
+                return {"selector": selector, "type": challenge_type, "visible": selectors[selector]}
+        return None
+
+    async def evaluate(script, arg=None):
+        # Emulate the in-browser probe
+        if script == _PAGE_PROBE_JS:
+            challenge_selectors, resolved_group, signals, max_len, need = arg
+            resolved = any(s in resolved_selectors for s in resolved_group.split(", "))
+            return {
+                "title": await page.title(),
+                "challenge": challenge_hit(challenge_selectors),
+                "resolved": resolved,
+                "signals": signal_hits(signals, max_len, need) or [],
+            }
+        return None
+
+    async def wait_for_function(script, arg=None, timeout=None, polling=None):
+        # Nothing changes while waiting: run out the timeout like the browser
+        # would, on the virtual clock
+        _clock.advance(timeout)
+        await asyncio.sleep(0)
+        raise TimeoutError(f"Timeout {timeout}ms exceeded.")
+
+    page.query_selector = AsyncMock(return_value=None)
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    page.wait_for_function = AsyncMock(side_effect=wait_for_function)
     return page
 
 
@@ -71,6 +118,9 @@ class TestChallengeDetection:
         assert d.detected is True
         assert d.challenge_type == ChallengeType.TURNSTILE
 
+    def test_uses_slots(self):
+        assert not hasattr(ChallengeDetection(), "__dict__")
+
 
 # --- ChallengeResult dataclass ---
 
@@ -82,6 +132,7 @@ class TestChallengeResult:
         assert r.method == "none"
         assert r.wait_time_ms == 0
         assert r.error is None
+        assert r.last_detection is None
 
     def test_successful_result(self):
         r = ChallengeResult(
@@ -93,6 +144,9 @@ class TestChallengeResult:
         assert r.resolved is True
         assert r.method == "auto_resolve"
 
+    def test_uses_slots(self):
+        assert not hasattr(ChallengeResult(), "__dict__")
+
 
 # --- detect_challenge ---
 
@@ -188,30 +242,72 @@ class TestDetectChallenge:
         assert result.challenge_type == ChallengeType.BROWSER_CHECK
 
     @pytest.mark.asyncio
-    async def test_title_exception_falls_through_to_selectors(self):
-        page = make_page(selectors={"#challenge-running": True})
-        page.title = AsyncMock(side_effect=Exception("Page closed"))
+    async def test_selector_probe_exception_is_swallowed(self):
+        page = make_page(title="Normal Page")
+        page.evaluate = AsyncMock(side_effect=Exception("Execution context destroyed"))
         result = await detect_challenge(page)
-        assert result.detected is True
-        assert result.challenge_type == ChallengeType.JS_CHALLENGE
+        # Should complete without crashing, returning no detection
+        assert result.detected is False
 
     @pytest.mark.asyncio
-    async def test_selector_exception_continues_to_next(self):
-        page = make_page(title="Normal Page")
-        call_count = 0
+    async def test_detection_is_a_single_evaluate(self):
+        page = make_page(title="Some Page", content="<html>cloudflare</html>")
+        await detect_challenge(page)
+        page.evaluate.assert_awaited_once()
+        assert page.evaluate.await_args.args[0] == _PAGE_PROBE_JS
+        page.query_selector.assert_not_awaited()
 
-        async def flaky_query(sel):
-            nonlocal call_count
-            call_count += 1
-            if call_count <= 3:
-                raise Exception("Flaky query")
-            return None
+    @pytest.mark.asyncio
+    async def test_detects_managed_challenge_from_content_signals(self):
+        page = make_page(
+            title="Some Page",
+            content="<html>Performance & security by Cloudflare. Ray ID: 8a1b</html>",
+        )
+        result = await detect_challenge(page)
+        assert result.detected is True
+        assert result.challenge_type == ChallengeType.MANAGED
+        assert result.selector_matched.startswith("content_heuristic:")
 
-        page.query_selector = AsyncMock(side_effect=flaky_query)
+    @pytest.mark.asyncio
+    async def test_repeated_single_content_signal_not_detected(self):
+        page = make_page(title="Some Page", content="<html>cloudflare cloudflare cloudflare</html>")
         result = await detect_challenge(page)
-        # Should complete without crashing, returning no detection
         assert result.detected is False
 
+    @pytest.mark.asyncio
+    async def test_content_heuristic_skips_large_pages_without_pulling_html(self):
+        big = "<html>cloudflare ray id" + "x" * 20000 + "</html>"
+        page = make_page(title="Some Page", content=big)
+        result = await detect_challenge(page)
+        assert result.detected is False
+        page.content.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_back_to_back_calls_probe_page_again(self):
+        """A same-URL reload that cleared the challenge is seen right away."""
+        page = make_page(title="Just a moment...")
+        assert (await detect_challenge(page)).detected is True
+        page.title = AsyncMock(return_value="Example Domain")
+        assert (await detect_challenge(page)).detected is False
+
+    @pytest.mark.asyncio
+    async def test_selector_priority_follows_list_order(self):
+        """With several challenge elements present, the earliest CHALLENGE_SELECTORS entry wins."""
+        page = make_page(
+            title="Some Page",
+            selectors={".cf-turnstile": True, "#challenge-running": True},
+        )
+        result = await detect_challenge(page)
+        assert result.challenge_type == ChallengeType.JS_CHALLENGE
+        assert result.selector_matched == "#challenge-running"
+
+    def test_probe_checks_selectors_one_by_one(self):
+        """The probe must not query the joined group, which returns the first match in document order."""
+        from app.challenge_solver import _CHALLENGE_SELECTOR_GROUP, _PAGE_PROBE_ARGS
+
+        assert _CHALLENGE_SELECTOR_GROUP not in _PAGE_PROBE_ARGS
+        assert "for (const [sel, type] of sels)" in _PAGE_PROBE_JS
+
     @pytest.mark.asyncio
     async def test_title_takes_priority_over_selectors(self):
         """Title match should return immediately, not check selectors."""
@@ -264,19 +360,21 @@ class TestWaitForChallengeResolution:
     async def test_resolves_via_resolved_selector(self):
         """Challenge detected via title, then #challenge-success appears on second poll."""
         page = make_page(title="Just a moment...")
-        query_call_count = 0
-
-        async def query_side_effect(sel):
-            nonlocal query_call_count
-            query_call_count += 1
-            # After a few query_selector calls, #challenge-success appears
-            if sel == "#challenge-success" and query_call_count >= 3:
-                return AsyncMock()  # Element exists -> resolved
-            return None
-
-        # Title stays as challenge title (detect_challenge returns detected=True via title)
-        # But the resolved selector check AFTER detect_challenge will find #challenge-success
-        page.query_selector = AsyncMock(side_effect=query_side_effect)
+        probe_count = 0
+        fake_evaluate = page.evaluate.side_effect
+
+        async def evaluate_side_effect(script, arg=None):
+            nonlocal probe_count
+            result = await fake_evaluate(script, arg)
+            # After a couple of polls, #challenge-success appears
+            if script == _PAGE_PROBE_JS:
+                probe_count += 1
+                if probe_count >= 2:
+                    result["resolved"] = True
+            return result
+
+        # Title stays as challenge title, but the fused probe reports a resolved indicator
+        page.evaluate = AsyncMock(side_effect=evaluate_side_effect)
 
         result = await wait_for_challenge_resolution(
             page, timeout_ms=5000, poll_interval_ms=50,
@@ -284,6 +382,52 @@ class TestWaitForChallengeResolution:
         assert result.resolved is True
         assert result.method == "auto_resolve"
 
+    @pytest.mark.asyncio
+    async def test_poll_uses_one_fused_probe(self):
+        page = make_page(title="Just a moment...")
+        await wait_for_challenge_resolution(page, timeout_ms=200, poll_interval_ms=50)
+        polls = [c for c in page.evaluate.await_args_list if c.args[0] == _PAGE_PROBE_JS]
+        assert polls
+        # Polls never pull the page HTML across IPC
+        page.content.assert_not_awaited()
+        page.query_selector.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_poll_interval_backs_off_while_page_unchanged(self):
+        page = make_page(title="Just a moment...")
+        with patch("app.challenge_solver.random.uniform", return_value=1.0):
+            await wait_for_challenge_resolution(page, timeout_ms=600, poll_interval_ms=50)
+
+        waits = [c.kwargs["timeout"] for c in page.wait_for_function.await_args_list]
+        assert waits[:3] == [50, 50, 100]
+        assert all(w <= 1500 for w in waits)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("title,selectors,expected_ms", [
+        ("Just a moment...", None, 300),
+        ("Some Page", {"#cf-challenge-running": True}, 800),
+        ("Some Page", {".cf-turnstile": True}, 400),
+    ])
+    async def test_default_poll_interval_depends_on_challenge_type(self, title, selectors, expected_ms):
+        page = make_page(title=title, selectors=selectors)
+        poll = AsyncMock(return_value=ChallengeResult(resolved=True))
+        with patch("app.challenge_solver._poll_for_resolution", poll):
+            await wait_for_challenge_resolution(page, timeout_ms=5000)
+        _page, _detection, _timeout, interval = poll.await_args.args
+        assert interval == expected_ms
+
+    @pytest.mark.asyncio
+    async def test_settle_wait_wakes_early_on_change(self):
+        """A settled page ends the wait immediately rather than sleeping the interval."""
+        page = make_page(title="Just a moment...")
+        titles = iter(["Just a moment...", "Just a moment..."])
+        page.title = AsyncMock(side_effect=lambda: next(titles, "Normal Page"))
+        page.wait_for_function = AsyncMock(return_value=True)
+
+        result = await wait_for_challenge_resolution(page, timeout_ms=5000, poll_interval_ms=1000)
+        assert result.resolved is True
+        assert result.wait_time_ms < 1000
+
     @pytest.mark.asyncio
     async def test_timeout_returns_failure(self):
         page = make_page(title="Just a moment...")
@@ -293,7 +437,44 @@ class TestWaitForChallengeResolution:
         )
         assert result.resolved is False
         assert "timeout" in result.error.lower()
+        assert result.wait_time_ms == 200
         assert result.challenge_type == ChallengeType.JS_CHALLENGE
+        assert result.last_detection.detected is True
+
+
+class TestChallengeAssetBlocking:
+    @pytest.mark.asyncio
+    async def test_route_installed_and_removed_around_wait(self):
+        page = make_page(title="Just a moment...")
+        await wait_for_challenge_resolution(page, timeout_ms=100, poll_interval_ms=50)
+        page.route.assert_awaited_once_with("**/*", _block_heavy_assets)
+        page.unroute.assert_awaited_once_with("**/*", _block_heavy_assets)
+
+    @pytest.mark.asyncio
+    async def test_no_route_when_disabled(self):
+        page = make_page(title="Just a moment...")
+        await wait_for_challenge_resolution(
+            page, timeout_ms=100, poll_interval_ms=50, block_assets=False,
+        )
+        page.route.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_no_route_on_clean_page(self):
+        page = make_page(title="Clean Page")
+        await wait_for_challenge_resolution(page, timeout_ms=100)
+        page.route.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("resource_type,aborted", [
+        ("image", True), ("font", True), ("media", True),
+        ("document", False), ("script", False), ("stylesheet", False),
+    ])
+    async def test_handler_aborts_only_heavy_types(self, resource_type, aborted):
+        route = AsyncMock()
+        route.request = MagicMock(resource_type=resource_type)
+        await _block_heavy_assets(route)
+        assert route.abort.await_count == (1 if aborted else 0)
+        assert route.fallback.await_count == (0 if aborted else 1)
 
 
 # --- solve_turnstile_capsolver ---
@@ -343,48 +524,142 @@ class TestSolveTurnstileCapSolver:
         assert "CAPSOLVER_API_KEY" not in (result.error or "")
 
 
+class TestInjectTurnstileToken:
+    @pytest.mark.asyncio
+    async def test_token_passed_as_argument(self):
+        from app.challenge_solver import _INJECT_TOKEN_JS, _inject_turnstile_token
+
+        page = AsyncMock()
+        token = "0.abc'def\"ghi"
+        await _inject_turnstile_token(page, token)
+        page.evaluate.assert_awaited_once_with(_INJECT_TOKEN_JS, token)
+        assert token not in _INJECT_TOKEN_JS
+
+
+class TestCapSolverSession:
+    @pytest.mark.asyncio
+    async def test_session_is_reused_until_closed(self):
+        from app.challenge_solver import _get_capsolver_session, close_capsolver_session
+
+        first = await _get_capsolver_session()
+        try:
+            assert await _get_capsolver_session() is first
+        finally:
+            await close_capsolver_session()
+        assert first.closed
+        second = await _get_capsolver_session()
+        try:
+            assert second is not first
+        finally:
+            await close_capsolver_session()
+
+    @pytest.mark.asyncio
+    async def test_warm_opens_session_only_with_api_key(self, monkeypatch):
+        import app.challenge_solver as cs
+
+        monkeypatch.delenv("CAPSOLVER_API_KEY", raising=False)
+        await cs.warm_capsolver_session()
+        assert cs._CAPSOLVER_SESSION is None
+
+        monkeypatch.setenv("CAPSOLVER_API_KEY", "test-key")
+        await cs.warm_capsolver_session()
+        try:
+            session = cs._CAPSOLVER_SESSION
+            assert session is not None and not session.closed
+            assert await cs._get_capsolver_session() is session
+        finally:
+            await cs.close_capsolver_session()
+
+    @pytest.mark.asyncio
+    async def test_poll_delays_back_off_with_jitter(self):
+        from itertools import islice
+
+        from app.challenge_solver import _capsolver_poll_delays
+
+        delays = list(islice(_capsolver_poll_delays(60000), 9))
+        assert delays[0] == 0
+        assert 0.75 <= delays[1] <= 1.25
+        assert all(d <= 5.0 * 1.25 for d in delays)
+        assert delays[-1] >= 5.0 * 0.75
+
+    @pytest.mark.asyncio
+    async def test_poll_delays_stop_at_deadline(self):
+        from app.challenge_solver import _capsolver_poll_delays
+
+        delays = list(_capsolver_poll_delays(0))
+        assert delays == []
+
+    @pytest.mark.asyncio
+    async def test_close_without_session_is_noop(self):
+        from app.challenge_solver import close_capsolver_session
+
+        await close_capsolver_session()
+        await close_capsolver_session()
+
+
 # --- _extract_turnstile_sitekey ---
 
 
+def make_sitekey_page(elements):
+    """Page whose sitekey probe sees elements: {selector: {attr: value}}."""
+    page = AsyncMock()
+
+    async def evaluate(script, arg=None):
+        assert script == _SITEKEY_PROBE_JS
+        for sel in arg:
+            attrs = elements.get(sel)
+            if not attrs:
+                continue
+            key = attrs.get("data-sitekey") or attrs.get("data-turnstile-sitekey")
+            if key:
+                return key
+            src = attrs.get("src") or ""
+            if "sitekey=" in src:
+                return src.split("sitekey=")[1].split("&")[0]
+        return None
+
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    return page
+
+
 class TestExtractTurnstileSitekey:
     @pytest.mark.asyncio
     async def test_extracts_from_data_sitekey_attribute(self):
-        page = AsyncMock()
-        el = AsyncMock()
-        el.get_attribute = AsyncMock(side_effect=lambda attr: "0x4AAAAAAA" if attr == "data-sitekey" else None)
-
-        async def query(sel):
-            if sel == ".cf-turnstile[data-sitekey]":
-                return el
-            return None
-
-        page.query_selector = AsyncMock(side_effect=query)
+        page = make_sitekey_page({".cf-turnstile[data-sitekey]": {"data-sitekey": "0x4AAAAAAA"}})
         result = await _extract_turnstile_sitekey(page)
         assert result == "0x4AAAAAAA"
 
     @pytest.mark.asyncio
     async def test_extracts_from_iframe_src(self):
-        page = AsyncMock()
-        el = AsyncMock()
-        el.get_attribute = AsyncMock(
-            side_effect=lambda attr: "https://challenges.cloudflare.com/cdn-cgi/challenge-platform/h/b/turnstile/if/ov2/av0/rcv0/0/iq12c/0x4BBBBBBB/auto/cbk/normal?sitekey=0x4BBBBBBB&action=managed"
-            if attr == "src"
-            else None
-        )
-
-        async def query(sel):
-            if 'iframe' in sel:
-                return el
-            return None
-
-        page.query_selector = AsyncMock(side_effect=query)
+        page = make_sitekey_page({
+            'iframe[src*="challenges.cloudflare.com"]': {
+                "src": "https://challenges.cloudflare.com/cdn-cgi/challenge-platform/h/b/turnstile/if/ov2/av0/rcv0/0/iq12c/0x4BBBBBBB/auto/cbk/normal?sitekey=0x4BBBBBBB&action=managed"
+            },
+        })
         result = await _extract_turnstile_sitekey(page)
         assert result == "0x4BBBBBBB"
 
+    @pytest.mark.asyncio
+    async def test_single_evaluate_in_selector_order(self):
+        page = make_sitekey_page({
+            "div[data-turnstile-sitekey]": {"data-turnstile-sitekey": "0x4CCCCCCC"},
+            'iframe[src*="challenges.cloudflare.com"]': {"src": "https://x/?sitekey=0x4DDDDDDD"},
+        })
+        result = await _extract_turnstile_sitekey(page)
+        assert result == "0x4CCCCCCC"
+        page.evaluate.assert_awaited_once()
+        page.query_selector.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_returns_none_when_no_sitekey_found(self):
+        page = make_sitekey_page({})
+        result = await _extract_turnstile_sitekey(page)
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_returns_none_when_evaluate_fails(self):
         page = AsyncMock()
-        page.query_selector = AsyncMock(return_value=None)
+        page.evaluate = AsyncMock(side_effect=Exception("Target closed"))
         result = await _extract_turnstile_sitekey(page)
         assert result is None
 
@@ -422,6 +697,34 @@ class TestResolveChallenge:
         assert result.resolved is True
         assert result.method == "auto_resolve"
 
+    @pytest.mark.asyncio
+    async def test_wait_reuses_pipeline_detection(self):
+        page = make_page(title="Just a moment...")
+        wait = AsyncMock(return_value=ChallengeResult(resolved=True, method="auto_resolve"))
+        with patch("app.challenge_solver.wait_for_challenge_resolution", wait):
+            await resolve_challenge(page, "https://g2.com")
+        detection = wait.await_args.kwargs["detection"]
+        assert detection.detected is True
+        assert page.title.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_capsolver_decision_uses_initial_detection(self, monkeypatch):
+        """The CapSolver gate follows the first detection, not the wait's last probe."""
+        page = make_page(title="Just a moment...")
+        last = ChallengeDetection(detected=True, challenge_type=ChallengeType.TURNSTILE, selector_matched=".cf-turnstile")
+        wait = AsyncMock(return_value=ChallengeResult(resolved=False, error="timeout", last_detection=last))
+        capsolver = AsyncMock(return_value=ChallengeResult(resolved=True, method="capsolver"))
+        with patch.multiple(
+            "app.challenge_solver",
+            wait_for_challenge_resolution=wait,
+            solve_turnstile_capsolver=capsolver,
+        ):
+            result = await resolve_challenge(page, "https://g2.com")
+        capsolver.assert_not_awaited()
+        assert result.resolved is False
+        assert result.challenge_type == ChallengeType.JS_CHALLENGE
+        assert result.last_detection is last
+
     @pytest.mark.asyncio
     async def test_non_turnstile_challenge_does_not_try_capsolver(self, monkeypatch):
         """JS challenge that doesn't resolve should NOT try CapSolver."""
@@ -524,6 +827,12 @@ class TestLocalizedChallengeDetection:
 
 
 class TestConstants:
+    def test_selector_groups_cover_all_selectors(self):
+        from app.challenge_solver import _CHALLENGE_SELECTOR_GROUP, _RESOLVED_SELECTOR_GROUP
+
+        assert _CHALLENGE_SELECTOR_GROUP.split(", ") == [s for s, _ in CHALLENGE_SELECTORS]
+        assert _RESOLVED_SELECTOR_GROUP.split(", ") == RESOLVED_SELECTORS
+
     def test_challenge_selectors_populated(self):
         assert len(CHALLENGE_SELECTORS) >= 6
 
@@ -42,6 +42,18 @@ def _fresh_import(module_name, mock_settings):
     return importlib.import_module(module_name)
 
 
+@pytest.fixture(autouse=True)
+def _restore_app_modules():
+    """Put the real app modules back after _fresh_import swaps them out.
+
+    Otherwise the fake app.config leaks into whatever test module runs next.
+    """
+    import app
+
+    with patch.dict(sys.modules), patch.dict(vars(app)):
+        yield
+
+
 # ---------------------------------------------------------------------------
 # Part A: CHROMIUM_STEALTH_ARGS constant
 # ---------------------------------------------------------------------------
@@ -21,7 +21,7 @@ class TestStoredCookie:
             name="cf_clearance",
             value="abc",
             domain="g2.com",
-            stored_at=time.time() - 2000,
+            stored_at=time.monotonic() - 2000,
             ttl_seconds=1500,
         )
         assert cookie.is_expired is True
@@ -36,6 +36,11 @@ class TestStoredCookie:
         )
         assert cookie.ttl_seconds == 600
 
+    def test_expired_at_uses_given_time(self):
+        cookie = StoredCookie(name="cf_clearance", value="abc", domain="g2.com", stored_at=100.0)
+        assert cookie.expired_at(1500.0) is False
+        assert cookie.expired_at(1601.0) is True
+
     def test_default_path(self):
         cookie = StoredCookie(name="cf_clearance", value="abc", domain="g2.com")
         assert cookie.path == "/"
@@ -103,7 +108,19 @@ class TestSaveFromContext:
 
         await store.save_from_context(context, "g2.com")
         key = store._key("g2.com")
-        assert store._store.get(key) == []
+        assert key not in store._store
+
+    async def test_keeps_previous_cookies_when_none_found(self):
+        store = CookieStore()
+        key = store._key("g2.com")
+        store._store[key] = [StoredCookie(name="cf_clearance", value="old", domain=".g2.com")]
+        context = AsyncMock()
+        context.cookies = AsyncMock(
+            return_value=[{"name": "_ga", "value": "GA123", "domain": ".g2.com", "path": "/"}]
+        )
+
+        await store.save_from_context(context, "g2.com")
+        assert store._store[key][0].value == "old"
 
     async def test_stores_with_proxy_key(self):
         store = CookieStore()
@@ -173,7 +190,7 @@ class TestLoadIntoContext:
                 name="cf_clearance",
                 value="expired",
                 domain=".g2.com",
-                stored_at=time.time() - 2000,
+                stored_at=time.monotonic() - 2000,
                 ttl_seconds=1500,
             ),
             StoredCookie(name="__cf_bm", value="valid", domain=".g2.com"),
@@ -185,6 +202,7 @@ class TestLoadIntoContext:
         assert loaded == 1
         cookies_arg = context.add_cookies.call_args[0][0]
         assert cookies_arg[0]["name"] == "__cf_bm"
+        assert [c.name for c in store._store[key]] == ["__cf_bm"]
 
     async def test_returns_zero_when_no_cookies(self):
         store = CookieStore()
@@ -202,7 +220,7 @@ class TestLoadIntoContext:
                 name="cf_clearance",
                 value="expired",
                 domain=".g2.com",
-                stored_at=time.time() - 2000,
+                stored_at=time.monotonic() - 2000,
                 ttl_seconds=1500,
             ),
         ]
@@ -211,6 +229,7 @@ class TestLoadIntoContext:
         loaded = await store.load_into_context(context, "g2.com")
         assert loaded == 0
         context.add_cookies.assert_not_called()
+        assert key not in store._store
 
     async def test_loads_with_proxy_key(self):
         store = CookieStore()
@@ -247,7 +266,7 @@ class TestClearExpired:
                 name="cf_clearance",
                 value="expired",
                 domain=".g2.com",
-                stored_at=time.time() - 2000,
+                stored_at=time.monotonic() - 2000,
                 ttl_seconds=1500,
             ),
         ]
@@ -273,7 +292,7 @@ class TestClearExpired:
                 name="cf_clearance",
                 value="expired",
                 domain=".g2.com",
-                stored_at=time.time() - 2000,
+                stored_at=time.monotonic() - 2000,
                 ttl_seconds=1500,
             ),
             StoredCookie(name="__cf_bm", value="valid", domain=".g2.com"),
@@ -291,7 +310,7 @@ class TestClearExpired:
                 name="cf_clearance",
                 value="expired",
                 domain=".g2.com",
-                stored_at=time.time() - 2000,
+                stored_at=time.monotonic() - 2000,
                 ttl_seconds=1500,
             ),
         ]
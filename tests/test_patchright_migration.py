@@ -51,6 +51,18 @@ def _fresh_import(module_name, mock_settings):
     return mod
 
 
+@pytest.fixture(autouse=True)
+def _restore_app_modules():
+    """Put the real app modules back after _fresh_import swaps them out.
+
+    Otherwise the fake app.config leaks into whatever test module runs next.
+    """
+    import app
+
+    with patch.dict(sys.modules), patch.dict(vars(app)):
+        yield
+
+
 # ---------------------------------------------------------------------------
 # browser.py tests
 # ---------------------------------------------------------------------------